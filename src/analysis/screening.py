@@ -0,0 +1,125 @@
+import operator
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ..config import SMART_TRADER_RULES
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class ScreeningRule:
+    """
+    A single condition on a trader column, e.g. `pnl_ratio >= 2`.
+    """
+
+    name: str
+    column: str
+    op: str
+    value: float
+
+    def __post_init__(self):
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unsupported operator '{self.op}' in rule {self.name}")
+
+    def evaluate(self, df: pd.DataFrame) -> pd.Series:
+        # Missing values never satisfy a rule
+        return OPERATORS[self.op](df[self.column], self.value).fillna(False)
+
+    def describe(self) -> str:
+        return f"{self.column} {self.op} {self.value}"
+
+
+@dataclass
+class ScreeningResult:
+    passed: pd.DataFrame
+    rule_masks: pd.DataFrame
+    rules: List[ScreeningRule] = field(default_factory=list)
+
+    @property
+    def wallets(self) -> List[str]:
+        return self.passed["wallet"].drop_duplicates().tolist()
+
+    def ranked_wallets(self) -> List[str]:
+        """
+        Wallets ordered by their best PnL ratio across tokens, then PnL, so
+        the most promising ones are scraped first when time runs short.
+        """
+        if self.passed.empty:
+            return []
+        best = self.passed.groupby("wallet", sort=False)[["pnl_ratio", "pnl"]].max()
+        best = best.sort_values(
+            ["pnl_ratio", "pnl"], ascending=False, kind="stable", na_position="last"
+        )
+        return best.index.tolist()
+
+    def pass_rates(self) -> pd.Series:
+        """
+        Share of all rows that satisfy each rule, useful for tuning thresholds.
+        """
+        return self.rule_masks.mean()
+
+
+class TraderScreener:
+    """
+    Screens trader rows with a configurable rule set. All rules are evaluated
+    as column expressions over the whole DataFrame at once.
+    """
+
+    def __init__(self, rules: Iterable[ScreeningRule] | None = None):
+        if rules is None:
+            rules = [ScreeningRule(*rule) for rule in SMART_TRADER_RULES]
+        self.rules = list(rules)
+
+    def screen(self, traders: pd.DataFrame) -> ScreeningResult:
+        df = self._add_derived_columns(traders)
+
+        rule_masks = pd.DataFrame(
+            {rule.name: rule.evaluate(df) for rule in self.rules},
+            index=df.index,
+        )
+        passed_mask = rule_masks.all(axis=1)
+        passed = df.loc[passed_mask].copy()
+        passed["reasons"] = self._reasons(passed)
+
+        logger.info(
+            f"{len(passed)} of {len(df)} trader rows passed {len(self.rules)} rules"
+        )
+        return ScreeningResult(passed=passed, rule_masks=rule_masks, rules=self.rules)
+
+    def _add_derived_columns(self, traders: pd.DataFrame) -> pd.DataFrame:
+        df = traders.copy()
+        # Rows without a transaction count are treated as having no buys
+        df["buy_txns"] = df["buy_txns"].fillna(0)
+        buy_usd_amount = df["buy_usd_amount"].astype("float64")
+        pnl = df["pnl"].astype("float64")
+        # Return multiple on the USD spent, undefined for rows without buys
+        df["pnl_ratio"] = pnl / buy_usd_amount.where(buy_usd_amount > 0, np.nan)
+        return df
+
+    def _reasons(self, passed: pd.DataFrame) -> pd.Series:
+        if passed.empty or not self.rules:
+            return pd.Series("", index=passed.index, dtype="string")
+
+        parts = [
+            rule.column
+            + "="
+            + passed[rule.column].round(4).astype("string")
+            + f" {rule.op} {rule.value}"
+            for rule in self.rules
+        ]
+        reasons = parts[0]
+        for part in parts[1:]:
+            reasons = reasons + "; " + part
+        return reasons
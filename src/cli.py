@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+# Only argparse is imported up front. Every command imports the modules it
+# needs, so e.g. `wallets` never loads the DexScreener scrapers.
+
+
+def _default_output(stage: str) -> str:
+    return f"{stage}_{int(time.time())}.csv"
+
+
+def _passthrough(argv: list[str]) -> list[str]:
+    # argparse.REMAINDER keeps the `--` separating snuffy's own arguments
+    return argv[1:] if argv[:1] == ["--"] else argv
+
+
+def _run_stage(coro):
+    from .utils.profiling import profiler
+
+    return asyncio.run(profiler.profile(coro))
+
+
+def tokens_command(args: argparse.Namespace):
+    from .pipeline import scrape_tokens
+
+    tokens = _run_stage(
+        scrape_tokens(
+            args.chain,
+            filter_args=args.filter,
+            from_page=args.from_page,
+            to_page=args.to_page,
+        )
+    )
+    tokens.to_csv(args.output or _default_output("tokens"), index=False)
+
+
+def traders_command(args: argparse.Namespace):
+    import pandas as pd
+
+    from .pipeline import scrape_traders, select_tokens
+
+    tokens = pd.read_csv(args.input)
+    addrs = tokens["address"].tolist() if args.all_tokens else select_tokens(tokens)
+    traders = _run_stage(scrape_traders(args.chain, addrs))
+    traders.to_csv(args.output or _default_output("traders"), index=False)
+
+
+def wallets_command(args: argparse.Namespace):
+    import pandas as pd
+
+    from .pipeline import record_wallet_history, scrape_wallets, select_wallets
+
+    traders = pd.read_csv(args.input)
+    if args.no_screen:
+        wallets = traders["wallet"].drop_duplicates().tolist()
+    else:
+        wallets = select_wallets(traders)
+
+    stats, holdings = _run_stage(scrape_wallets(wallets, chain_name=args.chain))
+    run_ts = int(time.time())
+    stats.to_csv(args.output or f"output_{run_ts}.csv", index=False)
+    if not holdings.empty:
+        holdings.to_csv(f"holdings_{run_ts}.csv", index=False)
+
+    if args.history:
+        changes = record_wallet_history(stats, run_ts)
+        changes.to_csv(f"changes_{run_ts}.csv", index=False)
+
+
+def run_command(args: argparse.Namespace):
+    from .main import run_task
+
+    if args.max_duration is None:
+        run_task()
+    else:
+        run_task(max_duration=args.max_duration)
+
+
+def schedule_command(args: argparse.Namespace):
+    from .main import run
+
+    run()
+
+
+def replay_command(args: argparse.Namespace):
+    from .storage.replay import main as replay_main
+
+    replay_main(_passthrough(args.replay_args))
+
+
+def loadtest_command(args: argparse.Namespace):
+    from .simulation.loadtest import main as loadtest_main
+
+    loadtest_main(_passthrough(args.loadtest_args))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from .config import TOKEN_FILTERS
+    from .models.chains import Chain
+
+    parser = argparse.ArgumentParser(
+        prog="snuffy",
+        description="Run the insider wallet pipeline or a single stage of it.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    tokens = commands.add_parser("tokens", help="Scrape the DexScreener token list")
+    tokens.add_argument("--chain", default="solana")
+    tokens.add_argument("--filter", default=TOKEN_FILTERS[0])
+    tokens.add_argument("--from-page", type=int, default=1)
+    tokens.add_argument("--to-page", type=int, default=2)
+    tokens.add_argument("--output", default=None)
+    tokens.set_defaults(func=tokens_command)
+
+    traders = commands.add_parser(
+        "traders", help="Scrape top traders of the tokens in a tokens file"
+    )
+    traders.add_argument("--input", required=True, help="Output of `tokens`")
+    traders.add_argument("--chain", default="solana")
+    traders.add_argument(
+        "--all-tokens",
+        action="store_true",
+        help="Skip the maker count and market cap selection",
+    )
+    traders.add_argument("--output", default=None)
+    traders.set_defaults(func=traders_command)
+
+    wallets = commands.add_parser(
+        "wallets", help="Scrape GMGN stats of the wallets in a traders file"
+    )
+    wallets.add_argument("--input", required=True, help="Output of `traders`")
+    wallets.add_argument(
+        "--chain", default=Chain.SOL.value, choices=[chain.value for chain in Chain]
+    )
+    wallets.add_argument(
+        "--no-screen",
+        action="store_true",
+        help="Scrape every wallet instead of screened smart traders",
+    )
+    wallets.add_argument(
+        "--history",
+        action="store_true",
+        help="Record the stats in the history store and write the changes",
+    )
+    wallets.add_argument("--output", default=None)
+    wallets.set_defaults(func=wallets_command)
+
+    run = commands.add_parser("run", help="Run the whole pipeline once")
+    run.add_argument(
+        "--max-duration",
+        type=float,
+        default=None,
+        help="Seconds after which no new work is started",
+    )
+    run.set_defaults(func=run_command)
+
+    schedule = commands.add_parser(
+        "schedule", help="Run now and then at every scheduled slot"
+    )
+    schedule.set_defaults(func=schedule_command)
+
+    replay = commands.add_parser(
+        "replay", help="Re-parse stored snapshots, see `replay -- --help`"
+    )
+    replay.add_argument("replay_args", nargs=argparse.REMAINDER)
+    replay.set_defaults(func=replay_command)
+
+    loadtest = commands.add_parser(
+        "loadtest",
+        help="Run the pipeline against a local mock server, see `loadtest -- --help`",
+    )
+    loadtest.add_argument("loadtest_args", nargs=argparse.REMAINDER)
+    loadtest.set_defaults(func=loadtest_command)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,101 @@
+# Number of DexScreener token list pages fetched concurrently. Each slot owns
+# one browser context that is reused for every page it processes.
+TOKENS_PREFETCH_WINDOW = 3
 
+# RSS thresholds of the browser process tree (driver and Chromium children)
+# for the memory governor. Python memory is not counted, recycling the
+# browser cannot release it. Past the context limit contexts are replaced,
+# past the browser limit the browser is relaunched.
+MEMORY_CONTEXT_RECYCLE_MB = 1500
+MEMORY_BROWSER_RECYCLE_MB = 2500
+
+# Rules a Top Traders row must satisfy to be treated as a smart trader, as
+# (name, column, operator, value). `pnl_ratio` is pnl / buy_usd_amount.
+SMART_TRADER_RULES = [
+    ("low_buy_txns", "buy_txns", "<=", 5),
+    ("min_2x_return", "pnl_ratio", ">=", 2),
+]
+
+# SQLite file holding every wallet stats snapshot, and the change thresholds
+# a wallet has to pass to be emitted again. USD amounts are compared relative
+# to the previous value, winrate and PnL percentages as absolute differences.
+WALLET_HISTORY_DB = "wallet_history.sqlite"
+WALLET_CHANGE_THRESHOLDS = {
+    "winrate": 0.02,
+    "pnl_pct": 0.05,
+    "total_pnl_usd_amount": 0.1,
+    "usd_balance": 0.1,
+}
+
+# Try a plain pooled HTTP request before opening a browser page. Connections
+# are kept alive and limited per host.
+HTTP_FAST_PATH = True
+HTTP_POOL_SIZE = 4
+HTTP_TIMEOUT = 15
+
+# Store the raw texts extracted from every page so parsers can be replayed
+# offline with `python -m src.storage.replay`.
+SNAPSHOT_CAPTURE = False
+SNAPSHOT_DIR = "snapshots"
+
+# Opt-in profiling: event-loop lag, parsing stages blocking the loop and
+# sampled CPU stacks of those stages are written to PROFILE_DIR/run_<ts>/.
+PROFILING = False
+PROFILE_DIR = "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.005
+LOOP_LAG_INTERVAL = 0.1
+LOOP_LAG_THRESHOLD = 0.1
+
+# DexScreener token list filters, one full run per entry, and the thresholds
+# a listed token must pass before its top traders are scraped.
+TOKEN_FILTERS = [
+    "rankBy=trendingScoreH24&order=desc&minMarketCap=1000000&minAge=150",
+]
+MIN_TOKEN_MAKER_COUNT = 5000
+MIN_TOKEN_MARKET_CAP_USD = 5000000
+
+# Adaptive (AIMD) concurrency for GMGN wallet pages. The limit grows by one
+# after every AIMD_WINDOW healthy completions and is multiplied by
+# AIMD_DECREASE_FACTOR on timeouts or a low success rate.
+WALLET_CONCURRENCY_MIN = 1
+WALLET_CONCURRENCY_MAX = 6
+WALLET_CONCURRENCY_INITIAL = 1
+AIMD_WINDOW = 5
+AIMD_LATENCY_TARGET = 45
+AIMD_MIN_SUCCESS_RATE = 0.8
+AIMD_DECREASE_FACTOR = 0.5
+
+# GMGN time windows collected per wallet visit, and whether the current
+# holdings table is read during the same visit.
+WALLET_DAYS_OPTIONS = ["7d", "30d"]
+WALLET_COLLECT_HOLDINGS = True
+
+# Top Traders rows harvested per token while scrolling the virtualized list,
+# and how many scrolls without new rows end the harvest.
+TRADERS_MAX_ROWS = 500
+TRADERS_MAX_IDLE_SCROLLS = 3
+
+# Schedule of the long-running process and the budget of each run. A run
+# stops starting new work RUN_DEADLINE_MARGIN seconds before the next slot,
+# or after RUN_MAX_DURATION seconds when set, and defers the lowest ranked
+# tokens and wallets. The traders stage may use TRADERS_BUDGET_SHARE of the
+# time left when it starts, the rest is kept for wallets.
+RUN_SCHEDULE = ["12:00", "18:00"]
+RUN_DEADLINE_MARGIN = 300
+RUN_MAX_DURATION = None
+TRADERS_BUDGET_SHARE = 0.4
+
+# Prometheus text metrics served by the long-running `run()` process at
+# http://METRICS_HOST:METRICS_PORT/metrics.
+METRICS_ENABLED = True
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+
+# Site roots and browser settings, read when used so the load test
+# (`python -m src.simulation.loadtest`) can point the scrapers at its local
+# mock server. HUMAN_DELAY_SCALE multiplies every human-like pause and
+# cool-down; 0 disables them.
+DEXSCREENER_BASE_URL = "https://dexscreener.com"
+GMGN_BASE_URL = "https://gmgn.ai"
+BROWSER_HEADLESS = False
+HUMAN_DELAY_SCALE = 1.0
@@ -1,103 +1,90 @@
 import asyncio
+import gc
 import time
 
-import pandas as pd
 import schedule
 from loguru import logger
 
-from .scraper.dexscreener_tokens_scraper import DexscreenerTokensScraper
-from .scraper.dexscreener_traders_scraper import DexscreenerTradersScraper
-from .scraper.wallet_portfolio_scraper import WalletPortfolioScraper
+from .config import METRICS_ENABLED, RUN_MAX_DURATION, RUN_SCHEDULE, TOKEN_FILTERS
+from .pipeline import (
+    record_wallet_history,
+    scrape_tokens,
+    scrape_traders,
+    scrape_wallets,
+    select_tokens,
+    select_wallets,
+)
+from .utils.budget import TOKENS, run_budget, run_deadline
+from .utils.memory import memory_governor
+from .utils.metrics import RUN_DURATION, RUN_FINISHED, MetricsServer
+from .utils.profiling import profiler
 
 # Configure loguru to write to file
 logger.add("error.log", rotation="500 MB", level="ERROR")
 
 
 async def main():
-    for filter in [
-        "?rankBy=trendingScoreH24&order=desc&minMarketCap=1000000&minAge=150",
-    ]:
-        try:
-            # Initialize the scraper
-            scraper = DexscreenerTokensScraper()
+    for filter in TOKEN_FILTERS:
+        if run_budget.expired:
+            run_budget.defer(TOKENS, [filter])
+            continue
 
-            res = await scraper.get_tokens(
+        try:
+            tokens = await scrape_tokens(
                 "solana",
+                filter_args=filter,
                 from_page=1,
                 to_page=2,
-                filter_args=filter,
             )
+            addrs = select_tokens(tokens)
 
-            # Create a pandas DataFrame
-            df = pd.DataFrame(res)
-
-            # Filter the DataFrame for maker_count > 1000 and market_cap_usd > 500,000
-            filtered_df = df[
-                (df["maker_count"] > 5000) & (df["market_cap_usd"] > 5000000)
-            ]
-            addrs = filtered_df["address"].tolist()
-
-            logger.info(f"Found {len(addrs)} tokens")
-
-            scraper = DexscreenerTradersScraper()
-            traders = []
-            for addr in addrs:
-                try:
-                    await asyncio.sleep(0.4)
-                    logger.info(f"Processing Token {addr}")
-                    token_traders = await scraper.get_top_traders(
-                        "solana",
-                        addr,
-                    )
-                    logger.info(f"Found {len(token_traders)} traders for {addr}")
-                    traders.extend(token_traders)
-                    break
-                except Exception as e:
-                    logger.error(f"Error processing address {addr}: {str(e)}")
-
-            pot_wallets = []
-
-            for trader in traders:
-                try:
-                    buy_value = trader.get("buy_value", 1)
-                    pnl = trader.get("pnl", 0)
-                    buy_txn = trader.get("buy_txns", 0)
-
-                    if buy_txn > 5:
-                        continue
-                    if pnl / buy_value < 2:  # Check if trader made at least 2x return
-                        continue
-
-                    wallet = trader.get("wallet", None)
-
-                    if wallet is None:
-                        continue
-                    pot_wallets.append(wallet)
-                except Exception:
-                    continue
-
-            scraper = WalletPortfolioScraper()
-
-            df = await scraper.get_wallet_stats(pot_wallets)
-            df.to_csv(f"output_{int(time.time())}.csv", index=False)
+            traders = await scrape_traders("solana", addrs)
+            pot_wallets = select_wallets(traders)
+
+            df, holdings = await scrape_wallets(pot_wallets)
+            run_ts = int(time.time())
+            df.to_csv(f"output_{run_ts}.csv", index=False)
+            if not holdings.empty:
+                holdings.to_csv(f"holdings_{run_ts}.csv", index=False)
+
+            changes = record_wallet_history(df, run_ts)
+            changes.to_csv(f"changes_{run_ts}.csv", index=False)
         except Exception as e:
             logger.error(f"An error occurred in main: {str(e)}")
 
+    deferred = run_budget.deferred_frame()
+    if not deferred.empty:
+        deferred.to_csv(f"deferred_{int(time.time())}.csv", index=False)
 
-def run_task():
+
+def run_task(max_duration: float | None = RUN_MAX_DURATION):
+    memory_governor.reset()
+    # Stop starting new work before the next scheduled run is due
+    run_budget.reset(deadline=run_deadline(max_duration=max_duration))
+    started = time.time()
     try:
-        asyncio.run(main())
+        asyncio.run(profiler.profile(main()))
     except Exception as e:
         logger.error(f"An error occurred while running the application: {str(e)}")
+    finally:
+        RUN_FINISHED.set(time.time())
+        RUN_DURATION.set(time.time() - started)
+        memory_governor.report()
+        run_budget.report()
+        # Drop the result lists and DataFrames of this run before sleeping
+        gc.collect()
 
 
 def run():
+    if METRICS_ENABLED:
+        MetricsServer().start()
+
     # Run immediately
     run_task()
 
     # Schedule the task to run at 12:00 PM (noon) and 6:00 PM
-    schedule.every().day.at("12:00").do(run_task)
-    schedule.every().day.at("18:00").do(run_task)
+    for slot in RUN_SCHEDULE:
+        schedule.every().day.at(slot).do(run_task)
 
     while True:
         schedule.run_pending()
@@ -0,0 +1,182 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FLOAT64 = "float64"
+FLOAT32 = "float32"
+NULLABLE_INT = "Int32"
+CATEGORY = "category"
+STRING = "string"
+
+
+@dataclass(slots=True)
+class TraderRecord:
+    """
+    A single row of the DexScreener Top Traders table.
+    """
+
+    wallet: str
+    chain: str
+    token_address: str
+    sol_scan_url: Optional[str] = None
+    buy_token_amount: Optional[float] = None
+    buy_txns: Optional[int] = None
+    sell_token_amount: Optional[float] = None
+    sell_txns: Optional[int] = None
+    buy_usd_amount: Optional[float] = None
+    sell_usd_amount: Optional[float] = None
+    pnl: Optional[float] = None
+    fetch_path: Optional[str] = None
+
+
+@dataclass(slots=True)
+class WalletStatsRecord:
+    """
+    Portfolio statistics of a wallet on GMGN for one time window.
+    """
+
+    wallet: str
+    chain: str
+    days_option: str
+    error: Optional[str] = None
+    total_pnl_usd_amount: Optional[float] = None
+    total_pnl_pct: Optional[float] = None
+    unrealized_usd_profit: Optional[float] = None
+    total_usd_cost: Optional[float] = None
+    token_avg_usd_cost: Optional[float] = None
+    token_avg_realized_usd_profit: Optional[float] = None
+    balance: Optional[float] = None
+    usd_balance: Optional[float] = None
+    pnl_pct: Optional[float] = None
+    winrate: Optional[float] = None
+    fetch_path: Optional[str] = None
+
+
+@dataclass(slots=True)
+class WalletProfile:
+    """
+    Everything collected for a wallet in a single GMGN page visit: stats per
+    time window and the current holdings table.
+    """
+
+    wallet: str
+    chain: str
+    stats: Dict[str, WalletStatsRecord] = field(default_factory=dict)
+    holdings: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class RecordTable:
+    """
+    Columnar buffer with a fixed schema. Records are appended straight into
+    typed arrays, so building the DataFrame does not need dtype inference.
+    """
+
+    schema: Dict[str, str] = {}
+
+    def __init__(self, records: Iterable[Any] = ()):
+        self._length = 0
+        self._columns: Dict[str, Any] = {}
+        self._masks: Dict[str, bytearray] = {}
+        self._categories: Dict[str, Dict[str, int]] = {}
+
+        for name, kind in self.schema.items():
+            if kind == FLOAT64:
+                self._columns[name] = array("d")
+            elif kind == FLOAT32:
+                self._columns[name] = array("f")
+            elif kind == NULLABLE_INT:
+                self._columns[name] = array("q")
+                self._masks[name] = bytearray()
+            elif kind == CATEGORY:
+                self._columns[name] = array("q")
+                self._categories[name] = {}
+            else:
+                self._columns[name] = []
+
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, record: Any):
+        for name, kind in self.schema.items():
+            value = getattr(record, name)
+            column = self._columns[name]
+            if kind in (FLOAT64, FLOAT32):
+                column.append(np.nan if value is None else value)
+            elif kind == NULLABLE_INT:
+                column.append(0 if value is None else int(value))
+                self._masks[name].append(value is None)
+            elif kind == CATEGORY:
+                if value is None:
+                    column.append(-1)
+                else:
+                    categories = self._categories[name]
+                    column.append(categories.setdefault(value, len(categories)))
+            else:
+                column.append(value)
+        self._length += 1
+
+    def extend(self, records: Iterable[Any]):
+        for record in records:
+            self.append(record)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        data = {}
+        for name, kind in self.schema.items():
+            column = self._columns[name]
+            if kind in (FLOAT64, FLOAT32):
+                data[name] = np.frombuffer(column, dtype=kind).copy()
+            elif kind == NULLABLE_INT:
+                values = np.frombuffer(column, dtype=np.int64).astype(np.int32)
+                mask = np.frombuffer(self._masks[name], dtype=np.bool_).copy()
+                data[name] = pd.arrays.IntegerArray(values, mask)
+            elif kind == CATEGORY:
+                data[name] = pd.Categorical.from_codes(
+                    np.frombuffer(column, dtype=np.int64),
+                    categories=list(self._categories[name]),
+                )
+            else:
+                data[name] = pd.array(column, dtype=STRING)
+        return pd.DataFrame(data, columns=list(self.schema))
+
+
+class TraderTable(RecordTable):
+    schema = {
+        "wallet": STRING,
+        "chain": CATEGORY,
+        "token_address": CATEGORY,
+        "sol_scan_url": STRING,
+        "buy_token_amount": FLOAT64,
+        "buy_txns": NULLABLE_INT,
+        "sell_token_amount": FLOAT64,
+        "sell_txns": NULLABLE_INT,
+        "buy_usd_amount": FLOAT64,
+        "sell_usd_amount": FLOAT64,
+        "pnl": FLOAT64,
+        "fetch_path": CATEGORY,
+    }
+
+
+class WalletStatsTable(RecordTable):
+    schema = {
+        "wallet": STRING,
+        "chain": CATEGORY,
+        "days_option": CATEGORY,
+        "error": STRING,
+        "total_pnl_usd_amount": FLOAT64,
+        "total_pnl_pct": FLOAT32,
+        "unrealized_usd_profit": FLOAT64,
+        "total_usd_cost": FLOAT64,
+        "token_avg_usd_cost": FLOAT64,
+        "token_avg_realized_usd_profit": FLOAT64,
+        "balance": FLOAT64,
+        "usd_balance": FLOAT64,
+        "pnl_pct": FLOAT32,
+        "winrate": FLOAT32,
+        "fetch_path": CATEGORY,
+    }
@@ -0,0 +1,169 @@
+import time
+from contextlib import aclosing
+from typing import List, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from .config import (
+    MIN_TOKEN_MAKER_COUNT,
+    MIN_TOKEN_MARKET_CAP_USD,
+    TRADERS_BUDGET_SHARE,
+    WALLET_COLLECT_HOLDINGS,
+    WALLET_DAYS_OPTIONS,
+)
+from .utils.budget import TOKENS, TRADERS, WALLETS, run_budget
+from .utils.metrics import FAILURE, IN_FLIGHT, ITEM_OUTCOMES, QUEUE_DEPTH, STAGE_ITEMS
+from .utils.profiling import DATAFRAME_BUILD, profiler
+
+# Scrapers, patchright and the storage layer are imported inside the stage
+# functions, so a stage only loads what it actually runs.
+
+
+async def scrape_tokens(
+    chain_name: str,
+    filter_args: str,
+    from_page: int = 1,
+    to_page: int = 2,
+) -> pd.DataFrame:
+    from .scraper.dexscreener_tokens_scraper import DexscreenerTokensScraper
+
+    scraper = DexscreenerTokensScraper()
+    res = await scraper.get_tokens(
+        chain_name,
+        from_page=from_page,
+        to_page=to_page,
+        filter_args=filter_args,
+    )
+    STAGE_ITEMS.inc(len(res), stage=TOKENS)
+
+    # Create a pandas DataFrame
+    with profiler.stage(DATAFRAME_BUILD):
+        return pd.DataFrame(res)
+
+
+def select_tokens(tokens: pd.DataFrame) -> List[str]:
+    """
+    Addresses of the tokens whose top traders are worth scraping, most
+    promising first.
+    """
+    if tokens.empty:
+        return []
+
+    filtered_df = tokens[
+        (tokens["maker_count"] > MIN_TOKEN_MAKER_COUNT)
+        & (tokens["market_cap_usd"] > MIN_TOKEN_MARKET_CAP_USD)
+    ]
+    # The list comes sorted by trending score, so the row position is the
+    # trending rank. It is averaged with the maker count rank.
+    trending_rank = pd.Series(range(len(filtered_df)), index=filtered_df.index)
+    maker_rank = filtered_df["maker_count"].rank(ascending=False, method="min")
+    priority = trending_rank.rank(method="min") + maker_rank
+    addrs = filtered_df.loc[
+        priority.sort_values(kind="stable").index, "address"
+    ].tolist()
+
+    logger.info(f"Found {len(addrs)} tokens")
+    return addrs
+
+
+async def scrape_traders(chain_name: str, addrs: List[str]) -> pd.DataFrame:
+    """
+    Scrape the top traders of `addrs` in order. Tokens that are not expected
+    to finish within the traders share of the run budget are deferred.
+    """
+    from .models.records import TraderTable
+    from .scraper.dexscreener_traders_scraper import DexscreenerTradersScraper
+    from .utils.scraper import human_delay
+
+    scraper = DexscreenerTradersScraper()
+    traders = TraderTable()
+    stage_deadline = run_budget.stage_deadline(TRADERS_BUDGET_SHARE)
+    for index, addr in enumerate(addrs):
+        QUEUE_DEPTH.set(len(addrs) - index - 1, stage=TRADERS)
+        if not run_budget.allows(TRADERS, deadline=stage_deadline):
+            deferred = addrs[index:]
+            run_budget.defer(TRADERS, deferred)
+            logger.warning(
+                f"Deferring {len(deferred)} tokens to the next run, "
+                f"{max(0.0, run_budget.remaining()):.0f}s of the run budget left"
+            )
+            break
+
+        started = time.time()
+        found = len(traders)
+        IN_FLIGHT.set(1, stage=TRADERS)
+        try:
+            await human_delay(0.4, 0.4)
+            logger.info(f"Processing Token {addr}")
+            # Rows are buffered as the list is scrolled, so those harvested
+            # before a failure are kept. Wallets still start once every token
+            # is done, since they are ranked over all trader rows.
+            async with aclosing(
+                scraper.stream_top_traders(chain_name, addr)
+            ) as records:
+                async for record in records:
+                    traders.append(record)
+            logger.info(f"Found {len(traders) - found} traders for {addr}")
+        except Exception as e:
+            ITEM_OUTCOMES.inc(stage=TRADERS, outcome=FAILURE)
+            logger.error(f"Error processing address {addr}: {str(e)}")
+        STAGE_ITEMS.inc(len(traders) - found, stage=TRADERS)
+        IN_FLIGHT.set(0, stage=TRADERS)
+        run_budget.observe(TRADERS, time.time() - started)
+    QUEUE_DEPTH.set(0, stage=TRADERS)
+
+    with profiler.stage(DATAFRAME_BUILD):
+        return traders.to_dataframe()
+
+
+def select_wallets(traders: pd.DataFrame) -> List[str]:
+    from .analysis.screening import TraderScreener
+
+    if traders.empty:
+        return []
+
+    screening = TraderScreener().screen(traders)
+    pot_wallets = screening.ranked_wallets()
+    logger.info(f"Found {len(pot_wallets)} smart trader wallets")
+    return pot_wallets
+
+
+async def scrape_wallets(
+    wallets: List[str],
+    chain_name: str = "sol",
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Scrape every configured time window and the holdings of each wallet.
+    Returns the stats (one row per wallet and window) and the holdings.
+    """
+    from .models.chains import Chain
+    from .models.days_options import DaysOptions
+    from .scraper.wallet_portfolio_scraper import WalletPortfolioScraper
+
+    chain = Chain.from_name(chain_name)
+    if chain is None:
+        raise ValueError(f"Unknown GMGN chain: {chain_name}")
+
+    scraper = WalletPortfolioScraper()
+    profiles = await scraper.get_wallet_profiles(
+        wallets,
+        chain=chain,
+        days_options=[DaysOptions(option) for option in WALLET_DAYS_OPTIONS],
+        with_holdings=WALLET_COLLECT_HOLDINGS,
+    )
+    STAGE_ITEMS.inc(sum(profile.error is None for profile in profiles), stage=WALLETS)
+    return (
+        scraper.profiles_to_stats_df(profiles),
+        scraper.profiles_to_holdings_df(profiles),
+    )
+
+
+def record_wallet_history(stats: pd.DataFrame, run_ts: int) -> pd.DataFrame:
+    from .storage.wallet_history import WalletHistoryStore
+
+    history = WalletHistoryStore()
+    try:
+        return history.record(stats, ts=run_ts)
+    finally:
+        history.close()
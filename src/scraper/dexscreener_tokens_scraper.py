@@ -1,27 +1,49 @@
+import asyncio
 import re
 from typing import Any, Dict
 
 from loguru import logger
 from patchright.async_api import (
-    Browser,
+    BrowserContext,
     TimeoutError,
     async_playwright,
 )
 
+from ..config import TOKENS_PREFETCH_WINDOW
+from ..storage.snapshots import TOKENS, SnapshotStore, snapshot_store
+from ..utils.budget import TOKENS as TOKEN_STAGE
+from ..utils.fetcher import Fetcher, HttpResponse
+from ..utils.metrics import (
+    FAILURE,
+    IN_FLIGHT,
+    ITEM_OUTCOMES,
+    QUEUE_DEPTH,
+    RETRY,
+    SUCCESS,
+)
+from ..utils.profiling import TOKEN_PARSE, profiler
 from ..utils.scraper import (
+    BrowserSession,
     human_delay,
     human_random_behaviour,
-    setup_browser,
     wait_for_cloudflare,
 )
 from ..utils.url import get_dexscreener_url
 
 MS_TIMEOUT = 30000
+TOKEN_TABLE_CLASSES = ("ds-dex-table", "ds-dex-table-top")
 
 
 class DexscreenerTokensScraper:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        prefetch_window: int = TOKENS_PREFETCH_WINDOW,
+        fetcher: Fetcher | None = None,
+        snapshots: SnapshotStore | None = None,
+    ):
+        self.prefetch_window = max(1, prefetch_window)
+        self.fetcher = fetcher or Fetcher()
+        self.snapshots = snapshots or snapshot_store
 
     async def get_tokens(
         self,
@@ -31,39 +53,149 @@ class DexscreenerTokensScraper:
         filter_args: str = "",
     ):
         async with async_playwright() as pwright:
-            browser = await setup_browser(pwright)
-            chrome = pwright.devices["Desktop Chrome"]
-            results = []
-            for page_num in range(from_page, to_page + 1):
-                res = await self._process_page(
-                    chain_name=chain_name,
-                    browser=browser,
-                    page_num=page_num,
-                    device=chrome,
-                    filter_args=filter_args,
+            session = BrowserSession(pwright)
+            # One slot per prefetch window entry, so at most `prefetch_window`
+            # pages are in flight at any time. Each slot lazily opens a browser
+            # context that is reused for every page it processes.
+            contexts: asyncio.Queue[BrowserContext | None] = asyncio.Queue()
+            page_count = max(0, to_page - from_page + 1)
+            for _ in range(min(self.prefetch_window, page_count)):
+                contexts.put_nowait(None)
+
+            try:
+                tasks = [
+                    self._fetch_page(
+                        session=session,
+                        contexts=contexts,
+                        chain_name=chain_name,
+                        page_num=page_num,
+                        filter_args=filter_args,
+                    )
+                    for page_num in range(from_page, to_page + 1)
+                ]
+
+                # gather keeps the task order, so rows stay in page order
+                pages = await asyncio.gather(*tasks)
+                results = []
+                for rows in pages:
+                    results.extend(rows)
+
+                return results
+            finally:
+                while not contexts.empty():
+                    context = contexts.get_nowait()
+                    if context is not None:
+                        await session.close_context(context)
+                await session.close()
+
+    async def _fetch_page(
+        self,
+        session: BrowserSession,
+        contexts: "asyncio.Queue[BrowserContext | None]",
+        chain_name: str,
+        page_num: int,
+        filter_args: str | None = None,
+    ) -> list[dict]:
+        url = get_dexscreener_url(
+            chain_name=chain_name,
+            page=page_num,
+            filter_args=filter_args,
+        )
+        result = await self.fetcher.fetch(
+            url,
+            parse_http=self._parse_tokens_html,
+            fetch_browser=lambda: self._process_page_with_context(
+                session=session,
+                contexts=contexts,
+                chain_name=chain_name,
+                page_num=page_num,
+                filter_args=filter_args,
+            ),
+        )
+        if result.value:
+            ITEM_OUTCOMES.inc(stage=TOKEN_STAGE, outcome=SUCCESS)
+        for row in result.value:
+            row["fetch_path"] = result.path.value
+        return result.value
+
+    async def _process_page_with_context(
+        self,
+        session: BrowserSession,
+        contexts: "asyncio.Queue[BrowserContext | None]",
+        chain_name: str,
+        page_num: int,
+        filter_args: str | None = None,
+    ) -> list[dict]:
+        QUEUE_DEPTH.inc(stage=TOKEN_STAGE)
+        try:
+            context = await contexts.get()
+        finally:
+            QUEUE_DEPTH.dec(stage=TOKEN_STAGE)
+
+        IN_FLIGHT.inc(stage=TOKEN_STAGE)
+        try:
+            if context is None:
+                context = await session.new_context(java_script_enabled=True)
+            await human_delay(0.3, 0.7)
+            return await self._process_page(
+                context=context,
+                chain_name=chain_name,
+                page_num=page_num,
+                filter_args=filter_args,
+            )
+        finally:
+            IN_FLIGHT.dec(stage=TOKEN_STAGE)
+            # The session swaps the context for a fresh one under memory pressure
+            if context is not None:
+                context = await session.release(
+                    context, keep=True, java_script_enabled=True
                 )
-                results.extend(res)
-                await human_delay(0.3, 0.7)
+            contexts.put_nowait(context)
 
-            return results
+    def _parse_tokens_html(self, response: HttpResponse) -> list[dict] | None:
+        table_element = response.document().find("div", TOKEN_TABLE_CLASSES)
+        if table_element is None:
+            return None
+
+        raw_rows = []
+        for row in table_element.find_all("a"):
+            href = row.get("href")
+            if not href:
+                continue
+            texts = [div.inner_text() for div in row.find_all("div")]
+            raw_rows.append({"href": href, "texts": texts})
+
+        if not raw_rows:
+            return None
+        self.snapshots.save(TOKENS, response.url, raw_rows)
+        return self._parse_token_rows(raw_rows)
+
+    def _parse_token_rows(self, raw_rows: list[dict]) -> list[Dict[str, Any]]:
+        """
+        Parse rows extracted from the token table, given as `href` and the
+        texts of the row's divs.
+        """
+        results = []
+        with profiler.stage(TOKEN_PARSE):
+            for raw_row in raw_rows:
+                parsed_data = self._parse_row(raw_row["texts"])
+                parsed_data["address"] = raw_row["href"].split("/")[-1]
+                results.append(parsed_data)
+        return results
 
     async def _process_page(
         self,
-        browser: Browser,
+        context: BrowserContext,
         chain_name: str,
         page_num: int | None = None,
         filter_args: str | None = None,
-        device: dict = {},
     ) -> list[dict]:
         retries = 0
         max_retries = 3
         while retries < max_retries:
+            page = None
             try:
                 logger.info(f"Processing page {page_num}")
-                context = await browser.new_context(
-                    java_script_enabled=True,
-                )
-
                 page = await context.new_page()
 
                 url = get_dexscreener_url(
@@ -82,46 +214,49 @@ class DexscreenerTokensScraper:
                 await human_delay(1, 5)
 
                 await human_random_behaviour(page)
-                selector = "div.ds-dex-table.ds-dex-table-top"
+                selector = "div." + ".".join(TOKEN_TABLE_CLASSES)
                 table_element = await page.query_selector(selector)
                 rows = await table_element.query_selector_all("a")
-                results = []
+                raw_rows = []
                 for row in rows:
                     href = await row.get_attribute("href")
-                    addr = href.split("/")[-1]
 
                     divs = await row.query_selector_all("div")
                     texts = []
                     for div in divs:
                         text = await div.inner_text()
                         texts.append(text)
-                    parsed_data = self._parse_row(texts)
-                    parsed_data["address"] = addr
-                    results.append(parsed_data)
+                    raw_rows.append({"href": href, "texts": texts})
 
-                return results
+                self.snapshots.save(TOKENS, url, raw_rows)
+                return self._parse_token_rows(raw_rows)
 
             except TimeoutError:
+                retries += 1
                 if retries < max_retries:
+                    ITEM_OUTCOMES.inc(stage=TOKEN_STAGE, outcome=RETRY)
                     logger.info(
-                        f"Retrying page processing due to timeout. Attempt {retries + 1} of {max_retries}."
+                        f"Retrying page processing due to timeout. Attempt {retries} of {max_retries}."
                     )
                 else:
+                    ITEM_OUTCOMES.inc(stage=TOKEN_STAGE, outcome=FAILURE)
                     logger.error(f"Failed to process page after {max_retries} retries.")
                     errMsg = "Process failed due to timeout. This could be due to: 1) Your proxy is being blocked, or 2) The wallet address is invalid. Please check the Recommendations section in the README for proxy configuration guidance and troubleshooting steps."
 
                     logger.error(errMsg)
-                    return
-                retries += 1
+                    return []
 
             except Exception as e:
-                retries += 1
                 errMsg = str(e)
                 logger.error(errMsg)
-                return
+                ITEM_OUTCOMES.inc(stage=TOKEN_STAGE, outcome=FAILURE)
+                return []
 
             finally:
-                await page.close()
+                if page is not None:
+                    await page.close()
+
+        return []
 
     def _parse_row(self, texts: list[str]) -> Dict[str, Any]:
         """
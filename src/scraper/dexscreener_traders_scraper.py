@@ -1,56 +1,157 @@
-from typing import Any, Dict, List
+from contextlib import aclosing
+from functools import partial
+from typing import AsyncIterator, List
 
 from loguru import logger
 from patchright.async_api import (
-    Browser,
+    BrowserContext,
     Page,
     TimeoutError,
     async_playwright,
 )
 
+from ..config import TRADERS_MAX_IDLE_SCROLLS, TRADERS_MAX_ROWS
+from ..models.records import TraderRecord
+from ..storage.snapshots import TRADERS, SnapshotStore, snapshot_store
+from ..utils.budget import TRADERS as TRADER_STAGE
+from ..utils.fetcher import Fetcher, FetchPath, HttpResponse
+from ..utils.metrics import FAILURE, ITEM_OUTCOMES, RETRY, SUCCESS
+from ..utils.profiling import TRADER_PARSE, profiler
 from ..utils.scraper import (
+    BrowserSession,
     human_delay,
     human_random_behaviour,
-    setup_browser,
     wait_for_cloudflare,
 )
+from ..utils.url import get_dexscreener_token_url
 
 MS_TIMEOUT = 60000
+# Scrolling an already rendered row is instant; a long wait means the list
+# is gone
+SCROLL_TIMEOUT = 5000
+
+# Href of the last link inside a div and the rendered text of every row that
+# has one; the header row has no link and is skipped
+READ_TRADER_ROWS_JS = """
+rows => rows.flatMap(row => {
+    const divs = Array.from(row.querySelectorAll("div")).filter(
+        div => div.querySelector("a")
+    );
+    const link = divs.length ? divs[divs.length - 1].querySelector("a") : null;
+    const href = link ? link.getAttribute("href") : null;
+    return href ? [{ sol_scan_url: href, stats: row.innerText.split("\\n") }] : [];
+})
+"""
 
 
 class DexscreenerTradersScraper:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        fetcher: Fetcher | None = None,
+        snapshots: SnapshotStore | None = None,
+    ):
+        self.fetcher = fetcher or Fetcher()
+        self.snapshots = snapshots or snapshot_store
 
     async def get_top_traders(
         self,
         chain_name: str,
         token_address: str,
-    ) -> List[Dict[str, Any]]:
-        async with async_playwright() as pwright:
-            browser = await setup_browser(pwright)
-            results = await self._process_token(
-                chain_name=chain_name,
-                token_address=token_address,
-                browser=browser,
-            )
-            await browser.close()
-            return results
+    ) -> List[TraderRecord]:
+        async with aclosing(
+            self.stream_top_traders(chain_name, token_address)
+        ) as records:
+            return [record async for record in records]
 
-    async def _process_token(
+    async def stream_top_traders(
         self,
-        browser: Browser,
         chain_name: str,
         token_address: str,
-    ) -> List[Dict[str, Any]]:
-        context = await browser.new_context(
-            java_script_enabled=True,
-        )
-        url = f"https://dexscreener.com/{chain_name}/{token_address}"
+        max_rows: int = TRADERS_MAX_ROWS,
+    ) -> AsyncIterator[TraderRecord]:
+        """
+        Yield top traders of a token as soon as they are parsed. Static HTML
+        is tried first, otherwise rows are harvested while the browser
+        scrolls through the virtualized list. Callers that may stop early
+        should wrap the stream in `contextlib.aclosing` so the browser is
+        closed right away.
+        """
+        url = get_dexscreener_token_url(chain_name, token_address)
+
+        def parse_http(response: HttpResponse) -> List[TraderRecord] | None:
+            records = self._parse_traders_html(response, chain_name, token_address)
+            return None if records is None else records[:max_rows]
+
+        path = None
+        async with aclosing(
+            self.fetcher.stream(
+                url,
+                parse_http=parse_http,
+                stream_browser=partial(
+                    self._stream_top_traders_in_browser,
+                    url,
+                    chain_name=chain_name,
+                    token_address=token_address,
+                    max_rows=max_rows,
+                ),
+            )
+        ) as results:
+            async for result in results:
+                path = result.path
+                result.value.fetch_path = path.value
+                yield result.value
+        # The browser stream records its own outcome
+        if path == FetchPath.HTTP:
+            ITEM_OUTCOMES.inc(stage=TRADER_STAGE, outcome=SUCCESS)
+
+    async def _stream_top_traders_in_browser(
+        self,
+        url: str,
+        chain_name: str,
+        token_address: str,
+        max_rows: int = TRADERS_MAX_ROWS,
+    ) -> AsyncIterator[TraderRecord]:
+        async with async_playwright() as pwright:
+            session = BrowserSession(pwright)
+            context = await session.new_context(
+                java_script_enabled=True,
+            )
+            page = None
+            try:
+                page = await self._open_top_traders(context, url)
+                if page is None:
+                    ITEM_OUTCOMES.inc(stage=TRADER_STAGE, outcome=FAILURE)
+                    return
+
+                async with aclosing(
+                    self._harvest_top_traders(
+                        page,
+                        chain_name=chain_name,
+                        token_address=token_address,
+                        max_rows=max_rows,
+                    )
+                ) as records:
+                    async for record in records:
+                        yield record
+                ITEM_OUTCOMES.inc(stage=TRADER_STAGE, outcome=SUCCESS)
+            finally:
+                if page is not None:
+                    await page.close()
+                await session.release(context)
+                await session.close()
 
+    async def _open_top_traders(
+        self,
+        context: BrowserContext,
+        url: str,
+    ) -> Page | None:
+        """
+        Open the token page on the Top Traders tab, or return None on failure.
+        """
         retries = 0
         max_retries = 3
         while retries < max_retries:
+            page = None
             try:
                 page = await context.new_page()
                 logger.info(f"Navigating to URL: {url}")
@@ -71,113 +172,245 @@ class DexscreenerTradersScraper:
                 await human_random_behaviour(page)
 
                 logger.info("Clicked on the 'Top Traders' tab.")
-
-                # Extract the wallets table
-                results = await self._extract_top_traders(page)
-                return results
+                return page
 
             except TimeoutError:
+                retries += 1
                 if retries < max_retries:
+                    ITEM_OUTCOMES.inc(stage=TRADER_STAGE, outcome=RETRY)
                     logger.info(
-                        f"Retrying due to timeout. Attempt {retries + 1} of {max_retries}."
+                        f"Retrying due to timeout. Attempt {retries} of {max_retries}."
                     )
                 else:
                     logger.error(
                         f"Failed to process token after {max_retries} retries."
                     )
-                    return []
-                retries += 1
+                if page is not None:
+                    await page.close()
 
             except Exception as e:
-                retries += 1
                 errMsg = str(e)
                 logger.error(f"Error processing token: {errMsg}")
-                return []
+                if page is not None:
+                    await page.close()
+                return None
 
-            finally:
-                await page.close()
+        return None
 
-    async def _extract_top_traders(self, page: Page) -> List[Dict[str, Any]]:
-        traders_data = []
+    async def _harvest_top_traders(
+        self,
+        page: Page,
+        chain_name: str,
+        token_address: str,
+        max_rows: int = TRADERS_MAX_ROWS,
+        max_idle_scrolls: int = TRADERS_MAX_IDLE_SCROLLS,
+    ) -> AsyncIterator[TraderRecord]:
+        """
+        Scroll through the virtualized Top Traders list and yield every newly
+        rendered row, deduplicated by wallet. Stops at `max_rows` or after
+        `max_idle_scrolls` scrolls without new rows.
+        """
         rank_element = page.locator("div span:has-text('RANK')")
-        parent_div = rank_element.locator("..").locator("..")
-        trader_rows = await parent_div.locator(":scope > *").all()
-        logger.info(f"Found {len(trader_rows)} trader rows")
+        rows = rank_element.locator("..").locator("..").locator(":scope > *")
 
-        for index, row in enumerate(trader_rows):
+        seen_wallets = set()
+        idle_scrolls = 0
+        while len(seen_wallets) < max_rows and idle_scrolls < max_idle_scrolls:
             try:
-                if index == 0:  # Skip header row
+                # One round trip per batch instead of one per row and field
+                rendered_rows = await rows.evaluate_all(READ_TRADER_ROWS_JS)
+            except Exception as e:
+                logger.error(f"Error reading trader rows: {e}")
+                return
+
+            if not rendered_rows and not seen_wallets:
+                # The list never rendered; scrolling would only wait it out
+                logger.warning(f"No trader rows rendered for {token_address}")
+                return
+
+            raw_rows = []
+            for raw_row in rendered_rows:
+                wallet = raw_row["sol_scan_url"].split("/")[-1]
+                if wallet in seen_wallets:
                     continue
+                seen_wallets.add(wallet)
+                raw_rows.append(raw_row)
+                if len(seen_wallets) >= max_rows:
+                    break
+
+            if raw_rows:
+                idle_scrolls = 0
+                self._save_snapshot(page.url, raw_rows, chain_name, token_address)
+                for record in self._parse_trader_rows(
+                    raw_rows, chain_name, token_address
+                ):
+                    yield record
+            else:
+                idle_scrolls += 1
+
+            if len(seen_wallets) >= max_rows:
+                break
 
-                # Get the last div containing an 'a' tag
-                sol_scan_url = (
-                    await row.locator("div:has(a)")
-                    .last.locator("a")
-                    .get_attribute("href")
-                )
-                wallet = sol_scan_url.split("/")[-1]
+            try:
+                await rows.last.scroll_into_view_if_needed(timeout=SCROLL_TIMEOUT)
+            except Exception as e:
+                logger.info(f"Could not scroll trader list: {e}")
+                idle_scrolls += 1
+            await human_delay(0.3, 0.8)
 
-                row_text = await row.inner_text()
-                stats = row_text.split("\n")
+        logger.info(f"Harvested {len(seen_wallets)} trader rows for {token_address}")
 
-                # Skip entries where buy amount is "-"
-                if stats[2] == "-":
-                    continue
+    def _save_snapshot(
+        self,
+        url: str,
+        raw_rows: List[dict],
+        chain_name: str,
+        token_address: str,
+    ):
+        self.snapshots.save(
+            TRADERS,
+            url,
+            {
+                "chain_name": chain_name,
+                "token_address": token_address,
+                "rows": raw_rows,
+            },
+        )
 
-                if len(stats) >= 6:
-                    buy_usd_amount = stats[2]
-                    sell_token_amount = stats[4]
-                    token_buy_info = stats[3]
-                    token_sell_info = stats[5]
-                    pnl = stats[6]
-
-                    # Initialize default values
-                    buy_token_amount = None
-                    buy_txns = None
-                    sell_txns = None
-
-                    # Parse buy info
-                    if token_buy_info != "-" and "/" in token_buy_info:
-                        buy_parts = token_buy_info.split("/")
-                        if len(buy_parts) == 2:
-                            buy_token_amount = self._parse_amount(buy_parts[0])
-                            buy_txns = buy_parts[1].replace("txns", "").strip()
-                            buy_txns = self._parse_amount(buy_txns)
-
-                    pnl = self._parse_amount(pnl)
-
-                    # Parse sell info
-                    if token_sell_info != "-" and "/" in token_sell_info:
-                        sell_parts = token_sell_info.split("/")
-                        if len(sell_parts) == 2:
-                            sell_token_amount = self._parse_amount(sell_parts[0])
-                            sell_txns = sell_parts[1].replace("txns", "").strip()
-                            sell_txns = self._parse_amount(sell_txns)
-
-                    # Parse USD amounts
-                    buy_usd_amount = self._parse_amount(buy_usd_amount)
-                    if isinstance(sell_token_amount, str):
-                        sell_token_amount = self._parse_amount(sell_token_amount)
-
-                    traders_data.append(
-                        {
-                            "sol_scan_url": sol_scan_url,
-                            "wallet": wallet,
-                            "buy_token_amount": buy_token_amount,
-                            "buy_txns": buy_txns,
-                            "sell_token_amount": sell_token_amount,
-                            "sell_txns": sell_txns,
-                            "buy_usd_amount": buy_usd_amount,
-                            "sell_usd_amount": sell_token_amount,
-                            "pnl": pnl,
-                        }
+    def _parse_trader_rows(
+        self,
+        raw_rows: List[dict],
+        chain_name: str,
+        token_address: str,
+    ) -> List[TraderRecord]:
+        traders_data = []
+        with profiler.stage(TRADER_PARSE):
+            for raw_row in raw_rows:
+                try:
+                    record = self._parse_trader_row(
+                        raw_row["sol_scan_url"],
+                        raw_row["stats"],
+                        chain_name=chain_name,
+                        token_address=token_address,
                     )
-            except Exception as e:
-                logger.error(f"Error processing trader row: {e}")
-                continue
+                    if record is not None:
+                        traders_data.append(record)
+                except Exception as e:
+                    logger.error(f"Error processing trader row: {e}")
+                    continue
 
         return traders_data
 
+    def _parse_traders_html(
+        self,
+        response: HttpResponse,
+        chain_name: str,
+        token_address: str,
+    ) -> List[TraderRecord] | None:
+        rank_element = next(
+            (
+                span
+                for span in response.document().find_all("span")
+                if span.inner_text() == "RANK"
+            ),
+            None,
+        )
+        # The table is only in the markup when it was rendered server-side
+        if rank_element is None or rank_element.parent.parent is None:
+            return None
+
+        raw_rows = []
+        trader_rows = rank_element.parent.parent.elements
+        for row in trader_rows[1:]:  # Skip header row
+            links = [
+                div.find("a")
+                for div in row.find_all("div")
+                if div.find("a") is not None
+            ]
+            if not links:
+                continue
+            raw_rows.append(
+                {
+                    "sol_scan_url": links[-1].get("href"),
+                    "stats": row.inner_text().split("\n"),
+                }
+            )
+
+        if not raw_rows:
+            return None
+        self._save_snapshot(response.url, raw_rows, chain_name, token_address)
+        return self._parse_trader_rows(raw_rows, chain_name, token_address) or None
+
+    def _parse_trader_row(
+        self,
+        sol_scan_url: str,
+        stats: List[str],
+        chain_name: str,
+        token_address: str,
+    ) -> TraderRecord | None:
+        """
+        Parse the text lines of a Top Traders row into a record.
+        """
+        wallet = sol_scan_url.split("/")[-1]
+
+        # Skip entries where buy amount is "-"
+        if stats[2] == "-":
+            return None
+
+        if len(stats) < 7:
+            return None
+
+        buy_usd_amount = stats[2]
+        sell_usd_amount = stats[4]
+        token_buy_info = stats[3]
+        token_sell_info = stats[5]
+        pnl = stats[6]
+
+        # Initialize default values
+        buy_token_amount = None
+        sell_token_amount = None
+        buy_txns = None
+        sell_txns = None
+
+        # Parse buy info
+        if token_buy_info != "-" and "/" in token_buy_info:
+            buy_parts = token_buy_info.split("/")
+            if len(buy_parts) == 2:
+                buy_token_amount = self._parse_amount(buy_parts[0])
+                buy_txns = buy_parts[1].replace("txns", "").strip()
+                buy_txns = self._parse_amount(buy_txns)
+
+        pnl = self._parse_amount(pnl)
+
+        # Parse sell info
+        if token_sell_info != "-" and "/" in token_sell_info:
+            sell_parts = token_sell_info.split("/")
+            if len(sell_parts) == 2:
+                sell_token_amount = self._parse_amount(sell_parts[0])
+                sell_txns = sell_parts[1].replace("txns", "").strip()
+                sell_txns = self._parse_amount(sell_txns)
+
+        # Parse USD amounts
+        buy_usd_amount = self._parse_amount(buy_usd_amount)
+        if sell_usd_amount != "-":
+            sell_usd_amount = self._parse_amount(sell_usd_amount)
+        else:
+            sell_usd_amount = None
+
+        return TraderRecord(
+            wallet=wallet,
+            chain=chain_name,
+            token_address=token_address,
+            sol_scan_url=sol_scan_url,
+            buy_token_amount=buy_token_amount,
+            buy_txns=None if buy_txns is None else int(buy_txns),
+            sell_token_amount=sell_token_amount,
+            sell_txns=None if sell_txns is None else int(sell_txns),
+            buy_usd_amount=buy_usd_amount,
+            sell_usd_amount=sell_usd_amount,
+            pnl=pnl,
+        )
+
     def _parse_amount(self, amount_text: str) -> float:
         """
         Parse amounts like '$1.3M', '$45K', handle multipliers.
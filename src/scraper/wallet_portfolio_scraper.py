@@ -2,27 +2,78 @@ import asyncio
 import re
 import time
 import unicodedata
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Dict, List, Optional, Sequence
 
 import pandas as pd
 from loguru import logger
-from patchright.async_api import Browser, Page, async_playwright
+from patchright.async_api import Page, async_playwright
 
 from ..models.chains import Chain
 from ..models.days_options import DaysOptions
+from ..models.records import WalletProfile, WalletStatsRecord, WalletStatsTable
+from ..storage.snapshots import WALLETS, SnapshotStore, snapshot_store
+from ..utils.budget import WALLETS as WALLET_STAGE
+from ..utils.budget import RunBudget, run_budget
+from ..utils.concurrency import AdaptiveLimiter
+from ..utils.fetcher import Fetcher, HttpResponse
+from ..utils.metrics import FAILURE, ITEM_OUTCOMES, RETRY, SUCCESS
 from ..utils.parsers import convert_percentage_to_float, convert_profic_string_to_float
+from ..utils.profiling import DATAFRAME_BUILD, WALLET_PARSE, profiler
 from ..utils.scraper import (
+    BrowserSession,
     human_delay,
     human_random_behaviour,
-    setup_browser,
     wait_for_cloudflare,
 )
 from ..utils.url import get_gmgn_url
 
 MS_TIMEOUT = 30000
+# GMGN renders this window on first load, other windows need a click
+GMGN_DEFAULT_DAYS_OPTION = DaysOptions.WEEK
+DAYS_TABS_SELECTOR = (
+    "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[1]/div[1]"
+)
+# Position of each window's button in the tabs, used when its text differs
+DAYS_TAB_POSITIONS = {DaysOptions.WEEK: 1, DaysOptions.MONTH: 2}
+HOLDINGS_TAB_TEXT = "Holding"
+# Holdings columns (normalized headers) holding amounts, the others, such as
+# the token symbol, are kept as text
+HOLDINGS_NUMERIC_COLUMNS = {
+    "value",
+    "usd_value",
+    "balance",
+    "bought",
+    "sold",
+    "unrealized",
+    "unrealized_profit",
+    "realized",
+    "realized_profit",
+    "total_profit",
+}
+WALLET_STATS_SELECTORS = {
+    "pnl": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[2]/div[1]/div[1]/div[2]",
+    "winrate": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[2]/div[1]/div[2]/div[2]",
+    "total_pnl": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[2]/div[2]",
+    "unrealized_profit": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[3]/div[2]",
+    "total_cost": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[4]/div[2]",
+    "token_avg_cost": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[5]/div[2]",
+    "token_avg_realized_profit": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[6]/div[2]",
+    "balance": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[7]/div[2]",
+}
 
 
 class WalletPortfolioScraper:
+    def __init__(
+        self,
+        fetcher: Fetcher | None = None,
+        snapshots: SnapshotStore | None = None,
+        budget: RunBudget | None = None,
+    ):
+        self.fetcher = fetcher or Fetcher()
+        self.snapshots = snapshots or snapshot_store
+        self.budget = budget or run_budget
+
     def _parse_balance_text(
         self,
         text: str,
@@ -78,35 +129,74 @@ class WalletPortfolioScraper:
         chain: Chain = Chain.SOL,
         days_option=DaysOptions.MONTH,
     ):
+        profiles = await self.get_wallet_profiles(
+            wallets, chain=chain, days_options=[days_option]
+        )
+        stats_df = self.profiles_to_stats_df(profiles)
+        stats_df.to_csv(f"tmp_wallet_stats_{time.time()}.csv", index=False)
+        return stats_df
+
+    async def get_wallet_profiles(
+        self,
+        wallets: List[str],
+        chain: Chain = Chain.SOL,
+        days_options: Sequence[DaysOptions] = (DaysOptions.MONTH,),
+        with_holdings: bool = False,
+    ) -> List[WalletProfile]:
+        """
+        Collect the stats of every requested window, and optionally the
+        holdings, with one page visit per wallet. Wallets are started in the
+        given order; those that would not finish within the run budget are
+        deferred and left out of the result.
+        """
         async with async_playwright() as pwright:
-            browser = await setup_browser(pwright)
+            session = BrowserSession(pwright)
 
             try:
-                max_concurrent_tasks = 1  # Maximum number of concurrent tasks
-                semaphore = asyncio.Semaphore(max_concurrent_tasks)
+                # Grows while GMGN responds well, shrinks on timeouts and errors
+                limiter = AdaptiveLimiter("Wallet scraping", stage=WALLET_STAGE)
                 tasks = [
                     self._process_wallet(
                         wallet,
                         chain=chain,
-                        days_option=days_option,
-                        semaphore=semaphore,
-                        browser=browser,
+                        days_options=days_options,
+                        with_holdings=with_holdings,
+                        limiter=limiter,
+                        session=session,
                     )
                     for wallet in wallets
                 ]
 
-                results = await asyncio.gather(*tasks)
-                stats_df = pd.DataFrame(results)
-                stats_df.to_csv(f"tmp_wallet_stats_{time.time()}.csv", index=False)
-                return stats_df
+                profiles = await asyncio.gather(*tasks)
+                return [profile for profile in profiles if profile is not None]
             finally:
-                await browser.close()
-                await pwright.stop()
+                await session.close()
+
+    def profiles_to_stats_df(self, profiles: List[WalletProfile]) -> pd.DataFrame:
+        with profiler.stage(DATAFRAME_BUILD):
+            return WalletStatsTable(
+                record for profile in profiles for record in profile.stats.values()
+            ).to_dataframe()
+
+    def profiles_to_holdings_df(self, profiles: List[WalletProfile]) -> pd.DataFrame:
+        with profiler.stage(DATAFRAME_BUILD):
+            return pd.DataFrame(
+                {"wallet": profile.wallet, "chain": profile.chain, **holding}
+                for profile in profiles
+                for holding in profile.holdings
+            )
 
-    async def _click_30_days(self, page: Page):
-        button = page.locator(
-            "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[1]/div[1]/div[2]"
-        )
+    async def _select_days_option(self, page: Page, days_option: DaysOptions):
+        tabs = page.locator(DAYS_TABS_SELECTOR)
+        button = tabs.get_by_text(
+            re.compile(f"^{re.escape(days_option.value)}$", re.IGNORECASE)
+        ).first
+
+        if await button.count() == 0 and days_option in DAYS_TAB_POSITIONS:
+            # Fall back to the position of the button
+            button = page.locator(
+                f"{DAYS_TABS_SELECTOR}/div[{DAYS_TAB_POSITIONS[days_option]}]"
+            )
 
         await button.click()
 
@@ -114,17 +204,93 @@ class WalletPortfolioScraper:
         self,
         wallet: str,
         chain: Chain,
-        semaphore: asyncio.Semaphore,
-        browser=Browser,
-        days_option=DaysOptions.MONTH,
-    ) -> Dict:
+        limiter: AdaptiveLimiter,
+        session: BrowserSession,
+        days_options: Sequence[DaysOptions] = (DaysOptions.MONTH,),
+        with_holdings: bool = False,
+    ) -> WalletProfile | None:
+        if self.budget.expired:
+            self.budget.defer(WALLET_STAGE, [wallet])
+            return None
+
+        url = get_gmgn_url(wallet, chain_name=chain.value)
+
+        def parse_http(response: HttpResponse) -> WalletProfile | None:
+            str_values = self._get_wallet_stats_texts_html(response)
+            if str_values is None:
+                return None
+            record = self._build_wallet_record(
+                url, wallet, chain.value, GMGN_DEFAULT_DAYS_OPTION.value, str_values
+            )
+            return WalletProfile(
+                wallet=wallet,
+                chain=chain.value,
+                stats={record.days_option: record},
+            )
+
+        # Static HTML only carries the default window and no holdings. A probe
+        # that cannot spare the browser visit is skipped, as it would only add
+        # requests outside the concurrency limit.
+        http_servable = (
+            list(days_options) == [GMGN_DEFAULT_DAYS_OPTION] and not with_holdings
+        )
+
+        result = await self.fetcher.fetch(
+            url,
+            parse_http=parse_http if http_servable else None,
+            fetch_browser=partial(
+                self._process_wallet_in_browser,
+                wallet,
+                chain=chain,
+                limiter=limiter,
+                session=session,
+                days_options=days_options,
+                with_holdings=with_holdings,
+            ),
+        )
+        profile = result.value
+        if profile is None:
+            return None
+        for record in profile.stats.values():
+            record.fetch_path = result.path.value
+
+        if profile.error is None:
+            ITEM_OUTCOMES.inc(stage=WALLET_STAGE, outcome=SUCCESS)
+        return profile
+
+    async def _process_wallet_in_browser(
+        self,
+        wallet: str,
+        chain: Chain,
+        limiter: AdaptiveLimiter,
+        session: BrowserSession,
+        days_options: Sequence[DaysOptions] = (DaysOptions.MONTH,),
+        with_holdings: bool = False,
+    ) -> WalletProfile | None:
         retries = 0
         max_retries = 3
 
         while retries < max_retries:
-            async with semaphore:
+            async with limiter.slot() as slot:
+                # Checked once a slot is free, as queued wallets may have
+                # waited for a long time
+                if not self.budget.allows(WALLET_STAGE):
+                    slot.cancel()
+                    self.budget.defer(WALLET_STAGE, [wallet], after_failure=retries > 0)
+                    if retries:
+                        logger.warning(
+                            f"Deferring wallet {wallet} to the next run after "
+                            f"{retries} failed attempts, its retry would miss "
+                            "the run deadline"
+                        )
+                    else:
+                        logger.info(f"Deferring wallet {wallet} to the next run")
+                    return None
+
+                context = None
+                page = None
                 try:
-                    context = await browser.new_context(
+                    context = await session.new_context(
                         java_script_enabled=True,
                         bypass_csp=True,
                     )
@@ -146,21 +312,41 @@ class WalletPortfolioScraper:
                     await self._close_modals(page)
                     await human_random_behaviour(page)
 
-                    await self._click_30_days(page)
-                    await human_delay(1, 5)
-
-                    stats = await self._get_wallet_stats_data(page)
-                    stats["wallet"] = wallet
-                    stats["chain"] = chain.value
-                    stats["error"] = None
-                    stats["days_option"] = days_option.value
+                    profile = WalletProfile(wallet=wallet, chain=chain.value)
+                    for days_option in days_options:
+                        await self._select_days_option(page, days_option)
+                        await human_delay(1, 5)
+
+                        profile.stats[days_option.value] = self._build_wallet_record(
+                            url,
+                            wallet,
+                            chain.value,
+                            days_option.value,
+                            await self._get_wallet_stats_texts(page),
+                        )
 
-                    logger.info(f"Wallet {wallet} processed successfully")
-                    return stats
+                    if with_holdings:
+                        # Best-effort, a missing table does not cost the stats
+                        try:
+                            profile.holdings = await self._get_holdings(page)
+                        except Exception as e:
+                            logger.warning(
+                                f"Could not read holdings of wallet {wallet}: {e}"
+                            )
+
+                    slot.success()
+                    self.budget.observe(WALLET_STAGE, slot.latency)
+                    logger.info(
+                        f"Wallet {wallet} processed successfully "
+                        f"(concurrency limit {limiter.limit})"
+                    )
+                    return profile
 
                 except Exception as e:
                     retries += 1
                     errMsg = str(e)
+                    slot.failure(timeout="Timeout" in errMsg)
+                    self.budget.observe(WALLET_STAGE, slot.latency)
 
                     if "Timeout" in errMsg:
                         errMsg = "Timeout error"
@@ -168,6 +354,10 @@ class WalletPortfolioScraper:
                     errMsg = f"Error processing wallet {wallet}: {errMsg}. Retrying..."
                     logger.error(errMsg)
 
+                    ITEM_OUTCOMES.inc(
+                        stage=WALLET_STAGE,
+                        outcome=FAILURE if retries >= max_retries else RETRY,
+                    )
                     if retries >= max_retries:
                         if "Timeout" in errMsg:
                             errMsg = "Process failed due to timeout. This could be due to: 1) Your proxy is being blocked, or 2) The wallet address is invalid. Please check the Recommendations section in the README for proxy configuration guidance and troubleshooting steps."
@@ -176,40 +366,126 @@ class WalletPortfolioScraper:
                         logger.error(
                             f"Failed to process wallet {wallet} after {max_retries} attempts"
                         )
-                        stats = {
-                            "wallet": wallet,
-                            "chain": chain.value,
-                            "days_option": days_option.value,
-                            "error": errMsg,
-                        }
-
-                        return stats
+                        return WalletProfile(
+                            wallet=wallet,
+                            chain=chain.value,
+                            stats={
+                                days_option.value: WalletStatsRecord(
+                                    wallet=wallet,
+                                    chain=chain.value,
+                                    days_option=days_option.value,
+                                    error=errMsg,
+                                )
+                                for days_option in days_options
+                            },
+                            error=errMsg,
+                        )
 
                 finally:
-                    await page.close()
-                    await context.close()
-                    await asyncio.sleep(5)
-
-    async def _get_wallet_stats_data(self, page: Page) -> Dict:
-        selectors = {
-            "pnl": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[2]/div[1]/div[1]/div[2]",
-            "winrate": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[2]/div[1]/div[2]/div[2]",
-            "total_pnl": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[2]/div[2]",
-            "unrealized_profit": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[3]/div[2]",
-            "total_cost": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[4]/div[2]",
-            "token_avg_cost": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[5]/div[2]",
-            "token_avg_realized_profit": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[6]/div[2]",
-            "balance": "xpath=//*[@id='__next']/div/div/main/div[2]/div[1]/div[2]/div[3]/div[7]/div[2]",
-        }
+                    if page is not None:
+                        await page.close()
+                    if context is not None:
+                        await session.release(context)
+                    await human_delay(5, 5)
+
+    async def _get_holdings(self, page: Page) -> List[Dict]:
+        """
+        Read the current holdings table. Cells are keyed by the table header,
+        and amount columns are converted to floats where possible.
+        """
+        await page.get_by_text(HOLDINGS_TAB_TEXT, exact=True).first.click()
+        await human_delay(1, 3)
 
+        table = page.locator("table").first
+        headers = [
+            self._normalize_text(text).lower().replace(" ", "_")
+            for text in await table.locator("thead th").all_inner_texts()
+        ]
+        rows = await table.locator("tbody tr").all()
+
+        holdings = []
+        for row in rows:
+            holding = self._parse_holding(
+                headers, await row.locator("td").all_inner_texts()
+            )
+            if holding:
+                holdings.append(holding)
+
+        logger.info(f"Found {len(holdings)} holdings")
+        return holdings
+
+    def _parse_holding(self, headers: List[str], cells: List[str]) -> Dict:
+        holding = {}
+        for header, cell in zip(headers, cells):
+            lines = [self._normalize_text(line) for line in cell.split("\n")]
+            lines = [line for line in lines if line]
+            if not header or not lines:
+                continue
+            value = lines[0]
+            if header in HOLDINGS_NUMERIC_COLUMNS:
+                amount = convert_profic_string_to_float(value)
+                value = value if amount is None else amount
+            holding[header] = value
+        return holding
+
+    async def _get_wallet_stats_texts(self, page: Page) -> Dict[str, str]:
         str_values = {}
-        for key, selector in selectors.items():
+        for key, selector in WALLET_STATS_SELECTORS.items():
             element = page.locator(selector).first
             text = await element.inner_text(timeout=MS_TIMEOUT)
-            text = unicodedata.normalize("NFC", text)
-            text = text.replace("\u00a0", " ").strip()
-            str_values[key] = text
+            str_values[key] = self._normalize_text(text)
 
+        return str_values
+
+    def _get_wallet_stats_texts_html(
+        self,
+        response: HttpResponse,
+    ) -> Dict[str, str] | None:
+        document = response.document()
+        str_values = {}
+        for key, selector in WALLET_STATS_SELECTORS.items():
+            element = document.xpath(selector)
+            if element is None:
+                return None
+            str_values[key] = self._normalize_text(element.inner_text())
+
+        return str_values
+
+    def _build_wallet_record(
+        self,
+        url: str,
+        wallet: str,
+        chain: str,
+        days_option: str,
+        str_values: Dict[str, str],
+    ) -> WalletStatsRecord:
+        self.snapshots.save(
+            WALLETS,
+            url,
+            {
+                "wallet": wallet,
+                "chain": chain,
+                "days_option": days_option,
+                "texts": str_values,
+            },
+        )
+        with profiler.stage(WALLET_PARSE):
+            stats = self._parse_wallet_stats(str_values)
+        return WalletStatsRecord(
+            wallet=wallet,
+            chain=chain,
+            days_option=days_option,
+            **stats,
+        )
+
+    def _normalize_text(self, text: str) -> str:
+        text = unicodedata.normalize("NFC", text)
+        return text.replace("\u00a0", " ").strip()
+
+    def _parse_wallet_stats(self, str_values: Dict[str, str]) -> Dict:
+        """
+        Convert the raw texts of the stats panel into numeric values.
+        """
         pnl_pct = convert_percentage_to_float(str_values["pnl"])
         winrate = convert_percentage_to_float(str_values["winrate"])
         unrealized_usd_profit = convert_profic_string_to_float(
@@ -0,0 +1,294 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+from loguru import logger
+
+from .. import config
+from .mock_server import (
+    ERROR,
+    INTERSTITIAL,
+    Latency,
+    MockServer,
+    MockSite,
+    MockSiteConfig,
+    RequestRecord,
+)
+
+
+@dataclass
+class StageReport:
+    name: str
+    items_in: int
+    items_out: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        return self.items_out / self.seconds if self.seconds else 0.0
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """
+    Nearest-rank percentile, `q` in [0, 100].
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_requests(records: List[RequestRecord]) -> Dict[str, Dict]:
+    """
+    Request count, outcomes and response time percentiles per route.
+    """
+    routes: Dict[str, List[RequestRecord]] = {}
+    for record in records:
+        routes.setdefault(record.route, []).append(record)
+
+    summary = {}
+    for route, route_records in sorted(routes.items()):
+        seconds = [record.seconds for record in route_records]
+        summary[route] = {
+            "requests": len(route_records),
+            "outcomes": dict(Counter(record.outcome for record in route_records)),
+            "p50_ms": _ms(percentile(seconds, 50)),
+            "p95_ms": _ms(percentile(seconds, 95)),
+            "p99_ms": _ms(percentile(seconds, 99)),
+            "max_ms": _ms(max(seconds)),
+        }
+    return summary
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _fetch_paths(df: pd.DataFrame) -> Dict[str, int]:
+    if df.empty or "fetch_path" not in df.columns:
+        return {}
+    return {
+        str(path): int(count) for path, count in df["fetch_path"].value_counts().items()
+    }
+
+
+async def run_load_test(site: MockSite, max_wallets: Optional[int] = None) -> Dict:
+    """
+    Drive one pipeline run the way `main()` does, against the mock site, and
+    report per-stage throughput, fetch paths and failures.
+    """
+    from ..pipeline import (
+        scrape_tokens,
+        scrape_traders,
+        scrape_wallets,
+        select_tokens,
+        select_wallets,
+    )
+
+    site_config = site.config
+    stages: List[StageReport] = []
+    to_page = max(1, math.ceil(site_config.tokens / site_config.tokens_per_page))
+
+    started = time.perf_counter()
+    tokens = await scrape_tokens(
+        "solana",
+        filter_args=config.TOKEN_FILTERS[0],
+        from_page=1,
+        to_page=to_page,
+    )
+    stages.append(
+        StageReport(
+            "tokens", site_config.tokens, len(tokens), time.perf_counter() - started
+        )
+    )
+    addrs = select_tokens(tokens)
+
+    started = time.perf_counter()
+    traders = await scrape_traders("solana", addrs)
+    expected_traders = len(addrs) * min(
+        site_config.traders_per_token, config.TRADERS_MAX_ROWS
+    )
+    stages.append(
+        StageReport(
+            "traders", expected_traders, len(traders), time.perf_counter() - started
+        )
+    )
+
+    wallets = select_wallets(traders)
+    if max_wallets is not None:
+        wallets = wallets[:max_wallets]
+
+    started = time.perf_counter()
+    stats, holdings = await scrape_wallets(wallets)
+    failed_wallets = (
+        int(stats.loc[stats["error"].notna(), "wallet"].nunique())
+        if "error" in stats.columns
+        else 0
+    )
+    stages.append(
+        StageReport(
+            "wallets",
+            len(wallets),
+            len(wallets) - failed_wallets,
+            time.perf_counter() - started,
+        )
+    )
+
+    return {
+        "stages": [
+            {**asdict(stage), "items_per_second": round(stage.throughput, 3)}
+            for stage in stages
+        ],
+        "fetch_paths": {
+            "tokens": _fetch_paths(tokens),
+            "traders": _fetch_paths(traders),
+            "wallets": _fetch_paths(stats),
+        },
+        "failures": {
+            "missing_tokens": site_config.tokens - len(tokens),
+            "missing_traders": expected_traders - len(traders),
+            "failed_wallets": failed_wallets,
+            "holdings_rows": len(holdings),
+        },
+    }
+
+
+def log_report(report: Dict):
+    for stage in report["stages"]:
+        logger.info(
+            f"Stage {stage['name']}: {stage['items_out']}/{stage['items_in']} items "
+            f"in {stage['seconds']:.1f}s ({stage['items_per_second']:.2f} items/s)"
+        )
+    for route, summary in report["requests"].items():
+        logger.info(
+            f"Route {route}: {summary['requests']} requests {summary['outcomes']}, "
+            f"p50 {summary['p50_ms']}ms p95 {summary['p95_ms']}ms "
+            f"p99 {summary['p99_ms']}ms max {summary['max_ms']}ms"
+        )
+    logger.info(f"Fetch paths: {report['fetch_paths']}")
+    logger.info(f"Failures: {report['failures']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run the pipeline against a local mock of DexScreener and GMGN "
+            "and report throughput, tail latency and failure handling."
+        )
+    )
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--tokens-per-page", type=int, default=100)
+    parser.add_argument("--traders-per-token", type=int, default=50)
+    parser.add_argument(
+        "--smart-ratio",
+        type=float,
+        default=0.2,
+        help="Share of trader rows that pass the smart trader rules",
+    )
+    parser.add_argument("--holdings-per-wallet", type=int, default=5)
+    parser.add_argument("--max-wallets", type=int, default=None)
+    parser.add_argument(
+        "--latency",
+        type=Latency.parse,
+        default=Latency(),
+        help="fixed:MS, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA (default %(default)s)",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--interstitial-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--interstitial-delay",
+        type=float,
+        default=1.5,
+        help="Seconds before the mock challenge clears itself",
+    )
+    parser.add_argument(
+        "--selector-delay",
+        type=float,
+        default=0.0,
+        help="Seconds before client-side content is rendered",
+    )
+    parser.add_argument(
+        "--delay-scale",
+        type=float,
+        default=0.0,
+        help="HUMAN_DELAY_SCALE during the run, 0 skips human-like pauses",
+    )
+    parser.add_argument(
+        "--max-duration",
+        type=float,
+        default=None,
+        help="Run budget in seconds, the rest is deferred",
+    )
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON report path")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None):
+    from ..utils.budget import run_budget
+    from ..utils.profiling import profiler
+
+    args = build_parser().parse_args(argv)
+    site = MockSite(
+        MockSiteConfig(
+            tokens=args.tokens,
+            tokens_per_page=args.tokens_per_page,
+            traders_per_token=args.traders_per_token,
+            smart_ratio=args.smart_ratio,
+            holdings_per_wallet=args.holdings_per_wallet,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            interstitial_rate=args.interstitial_rate,
+            interstitial_delay=args.interstitial_delay,
+            selector_delay=args.selector_delay,
+            seed=args.seed,
+        )
+    )
+    server = MockServer(site, port=args.port).start()
+
+    config.DEXSCREENER_BASE_URL = server.url
+    config.GMGN_BASE_URL = server.url
+    config.BROWSER_HEADLESS = not args.headed
+    config.HUMAN_DELAY_SCALE = args.delay_scale
+
+    run_budget.reset(
+        deadline=None if args.max_duration is None else time.time() + args.max_duration
+    )
+    started = time.perf_counter()
+    try:
+        report = asyncio.run(profiler.profile(run_load_test(site, args.max_wallets)))
+    finally:
+        server.stop()
+
+    records = site.log.records()
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["site"] = {**asdict(site.config), "latency": str(site.config.latency)}
+    report["requests"] = summarize_requests(records)
+    report["budget"] = run_budget.report()
+    report["injected"] = dict(
+        Counter(
+            record.outcome
+            for record in records
+            if record.outcome in (ERROR, INTERSTITIAL)
+        )
+    )
+
+    log_report(report)
+    output = args.output or f"loadtest_{int(time.time())}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Load test report written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+import html
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+# Routes of the mock, matching the URLs built by `utils.url`
+TOKENS_ROUTE = "tokens"
+TRADERS_ROUTE = "traders"
+WALLET_ROUTE = "wallet"
+OTHER_ROUTE = "other"
+
+# How a request was answered
+OK = "ok"
+ERROR = "error"
+INTERSTITIAL = "interstitial"
+NOT_FOUND = "not_found"
+
+CLEARANCE_COOKIE = "cf_clearance"
+WALLET_DAYS_OPTIONS = ["7d", "30d"]
+TRADER_ROW_HEIGHT = 64
+TRADER_WINDOW = 30
+
+
+@dataclass
+class Latency:
+    """
+    Response time distribution in milliseconds, parsed from `fixed:MS`,
+    `uniform:LOW,HIGH` or `lognormal:MEDIAN,SIGMA`.
+    """
+
+    kind: str = "lognormal"
+    a: float = 80
+    b: float = 0.5
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        kind, _, params = spec.partition(":")
+        values = [float(value) for value in params.split(",") if value]
+        if kind == "fixed" and len(values) == 1:
+            return cls(kind, values[0], 0)
+        if kind in ("uniform", "lognormal") and len(values) == 2:
+            return cls(kind, values[0], values[1])
+        raise ValueError(f"Invalid latency spec: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        Draw one response time, in seconds.
+        """
+        if self.kind == "fixed":
+            ms = self.a
+        elif self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        else:
+            ms = rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+        return max(ms, 0) / 1000
+
+    def __str__(self) -> str:
+        if self.kind == "fixed":
+            return f"fixed:{self.a:g}"
+        return f"{self.kind}:{self.a:g},{self.b:g}"
+
+
+@dataclass
+class MockSiteConfig:
+    """
+    Size of the simulated market and the faults injected into responses.
+    Rates are per request; `selector_delay` is how long the client-side
+    scripts wait before rendering the traders list, wallet stats panel and
+    holdings table.
+    """
+
+    tokens: int = 20
+    tokens_per_page: int = 100
+    traders_per_token: int = 50
+    smart_ratio: float = 0.2
+    holdings_per_wallet: int = 5
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    interstitial_rate: float = 0.0
+    interstitial_delay: float = 1.5
+    selector_delay: float = 0.0
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    route: str
+    status: int
+    outcome: str
+    seconds: float
+    ts: float
+
+
+class RequestLog:
+    """
+    Thread-safe record of every request answered by the mock server.
+    """
+
+    def __init__(self):
+        self._records: List[RequestRecord] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: RequestRecord):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> List[RequestRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+def _usd(value: float) -> str:
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    for suffix, unit in (("B", 1e9), ("M", 1e6), ("K", 1e3)):
+        if value >= unit:
+            return f"{sign}${value / unit:.1f}{suffix}"
+    return f"{sign}${value:.2f}"
+
+
+def _amount(value: float) -> str:
+    for suffix, unit in (("M", 1e6), ("K", 1e3)):
+        if value >= unit:
+            return f"{value / unit:.1f}{suffix}"
+    return f"{value:.0f}"
+
+
+def _pct(value: float, signed: bool = False) -> str:
+    return f"{value:+.1f}%" if signed else f"{value:.1f}%"
+
+
+class MockSite:
+    """
+    Deterministic DexScreener and GMGN pages. Every token, trader row and
+    wallet is derived from the seed and its own identifier, so repeated
+    requests for the same item return the same data.
+    """
+
+    def __init__(self, config: MockSiteConfig):
+        self.config = config
+        self.log = RequestLog()
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+
+    def _item_rng(self, key: str) -> random.Random:
+        return random.Random(zlib.crc32(f"{self.config.seed}:{key}".encode()))
+
+    def roll(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def sample_latency(self) -> float:
+        with self._rng_lock:
+            return self.config.latency.sample(self._rng)
+
+    # Data
+
+    def token_address(self, index: int) -> str:
+        return f"MockTok{index:06d}"
+
+    def token(self, index: int) -> Dict:
+        rng = self._item_rng(self.token_address(index))
+        # Every listed token passes the pipeline's maker and market cap rules
+        return {
+            "address": self.token_address(index),
+            "symbol": f"MT{index}",
+            "name": f"Mock Token {index}",
+            "price": rng.uniform(0.0001, 5),
+            "age_days": rng.randint(7, 400),
+            "txns": rng.randint(10_000, 500_000),
+            "volume": rng.uniform(1e6, 5e7),
+            "makers": rng.randint(6_000, 80_000),
+            "changes": [rng.uniform(-30, 30) for _ in range(4)],
+            "liquidity": rng.uniform(1e5, 5e6),
+            "market_cap": rng.uniform(6e6, 5e8),
+        }
+
+    def token_index(self, address: str) -> Optional[int]:
+        match = re.fullmatch(r"MockTok(\d{6})", address)
+        if match is None or int(match.group(1)) >= self.config.tokens:
+            return None
+        return int(match.group(1))
+
+    def traders(self, token_index: int) -> List[List]:
+        """
+        Top Traders rows as the texts of their cells plus the wallet. Roughly
+        `smart_ratio` of them pass the smart trader rules.
+        """
+        rows = []
+        for rank in range(1, self.config.traders_per_token + 1):
+            wallet = f"MockW{token_index:06d}x{rank:05d}"
+            rng = self._item_rng(wallet)
+            buy_usd = rng.uniform(100, 50_000)
+            if rng.random() < self.config.smart_ratio:
+                buy_txns = rng.randint(1, 5)
+                pnl = buy_usd * rng.uniform(2, 20)
+            else:
+                buy_txns = rng.randint(1, 40)
+                pnl = buy_usd * rng.uniform(-1, 1.9)
+            tokens_bought = buy_usd / rng.uniform(0.001, 2)
+
+            if rng.random() < 0.1:
+                sell_usd, sell_info = "-", "-"
+            else:
+                sell_usd = _usd(buy_usd + pnl)
+                sell_info = f"{_amount(tokens_bought)} / {rng.randint(1, 30)} txns"
+
+            rows.append(
+                [
+                    rank,
+                    f"{wallet[:4]}...{wallet[-4:]}",
+                    _usd(buy_usd),
+                    f"{_amount(tokens_bought)} / {buy_txns} txns",
+                    sell_usd,
+                    sell_info,
+                    _usd(pnl),
+                    wallet,
+                ]
+            )
+        return rows
+
+    def wallet_stats(self, wallet: str) -> Dict[str, Dict[str, str]]:
+        """
+        Texts of the GMGN stats panel for every time window.
+        """
+        stats = {}
+        for days_option in WALLET_DAYS_OPTIONS:
+            rng = self._item_rng(f"{wallet}:{days_option}")
+            cost = rng.uniform(1_000, 500_000)
+            pnl_pct = rng.uniform(-80, 900)
+            balance = rng.uniform(0.1, 5_000)
+            stats[days_option] = {
+                "pnl": _pct(pnl_pct, signed=True),
+                "winrate": _pct(rng.uniform(10, 95)),
+                "total_pnl": f"{_usd(cost * pnl_pct / 100)} {_pct(pnl_pct, signed=True)}",
+                "unrealized_profit": _usd(rng.uniform(-5_000, 50_000)),
+                "total_cost": _usd(cost),
+                "token_avg_cost": _usd(cost / rng.randint(1, 50)),
+                "token_avg_realized_profit": _usd(rng.uniform(-1_000, 20_000)),
+                "balance": f"{balance:.2f} SOL ({_usd(balance * 150)})",
+            }
+        return stats
+
+    def holdings(self, wallet: str) -> List[List[str]]:
+        rng = self._item_rng(f"{wallet}:holdings")
+        return [
+            [
+                f"HOLD{rng.randint(0, 9999)}",
+                _usd(rng.uniform(10, 100_000)),
+                _amount(rng.uniform(1, 1e7)),
+                _usd(rng.uniform(-5_000, 50_000)),
+                _usd(rng.uniform(-5_000, 50_000)),
+            ]
+            for _ in range(self.config.holdings_per_wallet)
+        ]
+
+    # Pages
+
+    def tokens_page(self, chain: str, page: int) -> str:
+        start = (page - 1) * self.config.tokens_per_page
+        end = min(start + self.config.tokens_per_page, self.config.tokens)
+        rows = []
+        for index in range(start, end):
+            token = self.token(index)
+            cells = [
+                token["symbol"],
+                f"#{index + 1}",
+                token["name"],
+                f"${token['price']:.6f}",
+                f"{token['age_days']}d",
+                f"{token['txns']:,}",
+                _usd(token["volume"]),
+                f"{token['makers']:,}",
+                *[_pct(change) for change in token["changes"]],
+                _usd(token["liquidity"]),
+                _usd(token["market_cap"]),
+            ]
+            divs = "".join(f"<div>{html.escape(cell)}</div>" for cell in cells)
+            rows.append(
+                f'<a class="ds-dex-table-row" href="/{chain}/{token["address"]}">{divs}</a>'
+            )
+
+        return (
+            "<!DOCTYPE html><html><head><title>DEX Screener</title></head><body>"
+            '<div class="ds-dex-table ds-dex-table-top">'
+            f"{''.join(rows)}</div></body></html>"
+        )
+
+    def traders_page(self, token_index: int) -> str:
+        """
+        Token page whose Top Traders list is only rendered client-side, as a
+        virtualized window of TRADER_WINDOW rows that moves on scroll.
+        """
+        token = self.token(token_index)
+        return f"""<!DOCTYPE html><html><head>
+<title>{token["symbol"]} | DEX Screener</title>
+<style>
+#list {{ height: 480px; overflow-y: auto; }}
+#list > .row {{ height: {TRADER_ROW_HEIGHT}px; overflow: hidden; }}
+</style></head><body>
+<nav><button id="tab-txns">Transactions</button><button id="tab-top">Top Traders</button></nav>
+<div id="content"></div>
+<script>
+const TRADERS = {json.dumps(self.traders(token_index))};
+const ROW_HEIGHT = {TRADER_ROW_HEIGHT};
+const WINDOW = {TRADER_WINDOW};
+const HEADER = '<div class="row"><span>RANK</span><span>MAKER</span><span>BOUGHT</span><span>SOLD</span><span>PNL</span></div>';
+let rendered = -1;
+function rowHtml(t) {{
+  return '<div class="row"><div>#' + t[0] + '</div><div>' + t[1] + '</div><div>' + t[2] +
+    '</div><div>' + t[3] + '</div><div>' + t[4] + '</div><div>' + t[5] + '</div><div>' + t[6] +
+    '</div><div><a href="https://solscan.io/account/' + t[7] + '">Solscan</a></div></div>';
+}}
+function render() {{
+  const list = document.getElementById("list");
+  const start = Math.min(
+    Math.floor(list.scrollTop / ROW_HEIGHT),
+    Math.max(0, TRADERS.length - WINDOW)
+  );
+  if (start === rendered) return;
+  rendered = start;
+  const scrollTop = list.scrollTop;
+  list.innerHTML = HEADER + '<div style="height:' + start * ROW_HEIGHT + 'px"></div>' +
+    TRADERS.slice(start, start + WINDOW).map(rowHtml).join("");
+  list.scrollTop = scrollTop;
+}}
+document.getElementById("tab-top").addEventListener("click", () => {{
+  setTimeout(() => {{
+    document.getElementById("content").innerHTML = '<div id="list"></div>';
+    document.getElementById("list").addEventListener("scroll", render);
+    render();
+  }}, {int(self.config.selector_delay * 1000)});
+}});
+</script></body></html>"""
+
+    def wallet_page(self, wallet: str) -> str:
+        """
+        GMGN wallet page laid out for the scraper's XPaths. The default 7d
+        window is in the markup unless `selector_delay` defers the panel.
+        """
+        stats = self.wallet_stats(wallet)
+        default = stats[WALLET_DAYS_OPTIONS[0]]
+
+        def stat(label: str, key: str) -> str:
+            return (
+                f"<div><div>{label}</div>"
+                f'<div data-field="{key}">{html.escape(default[key])}</div></div>'
+            )
+
+        tabs = "".join(
+            f'<div data-days="{days_option}">{days_option}</div>'
+            for days_option in WALLET_DAYS_OPTIONS
+        )
+        panel = (
+            f"<div><div>{tabs}</div></div>"
+            f"<div><div>{stat('Realized PnL', 'pnl')}{stat('Win Rate', 'winrate')}</div></div>"
+            "<div><div>Analysis</div>"
+            f"{stat('Total PnL', 'total_pnl')}"
+            f"{stat('Unrealized Profits', 'unrealized_profit')}"
+            f"{stat('Total Cost', 'total_cost')}"
+            f"{stat('Token Avg Cost', 'token_avg_cost')}"
+            f"{stat('Token Avg Realized Profits', 'token_avg_realized_profit')}"
+            f"{stat('Balance', 'balance')}"
+            "</div>"
+        )
+        headers = ["Token", "Value", "Balance", "Unrealized", "Realized"]
+        table = (
+            "<table><thead><tr>"
+            + "".join(f"<th>{header}</th>" for header in headers)
+            + "</tr></thead><tbody>"
+            + "".join(
+                "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>"
+                for row in self.holdings(wallet)
+            )
+            + "</tbody></table>"
+        )
+
+        deferred = self.config.selector_delay > 0
+        return f"""<!DOCTYPE html><html><head><title>GMGN.AI</title></head><body>
+<div id="__next"><div><div><main>
+<div>GMGN</div>
+<div>
+<div><div>{html.escape(wallet)}</div><div id="panel">{"" if deferred else panel}</div></div>
+<div><div id="holding-tab">Holding</div><div id="holdings"></div></div>
+</div>
+</main></div></div></div>
+<script>
+const STATS = {json.dumps(stats)};
+const PANEL = {json.dumps(panel)};
+const TABLE = {json.dumps(table)};
+const DELAY = {int(self.config.selector_delay * 1000)};
+if (DELAY > 0) {{
+  setTimeout(() => {{ document.getElementById("panel").innerHTML = PANEL; }}, DELAY);
+}}
+document.addEventListener("click", event => {{
+  const tab = event.target.closest("[data-days]");
+  if (tab) {{
+    for (const el of document.querySelectorAll("[data-field]")) {{
+      el.textContent = STATS[tab.dataset.days][el.dataset.field];
+    }}
+  }}
+  if (event.target.id === "holding-tab") {{
+    setTimeout(() => {{ document.getElementById("holdings").innerHTML = TABLE; }}, DELAY);
+  }}
+}});
+</script></body></html>"""
+
+    def interstitial_page(self) -> str:
+        return f"""<!DOCTYPE html><html><head><title>Just a moment...</title></head>
+<body>Checking your browser before accessing the site.
+<script>
+setTimeout(() => {{
+  document.cookie = "{CLEARANCE_COOKIE}=mock; path=/";
+  location.reload();
+}}, {int(self.config.interstitial_delay * 1000)});
+</script></body></html>"""
+
+    def route(self, path: str) -> Tuple[str, Optional[str]]:
+        """
+        Route name and page for a request path; the page is None for
+        unknown paths.
+        """
+        parts = [part for part in path.split("/") if part]
+        if len(parts) == 3 and parts[1] == "address":
+            return WALLET_ROUTE, self.wallet_page(parts[2])
+        if len(parts) == 1:
+            return TOKENS_ROUTE, self.tokens_page(parts[0], 1)
+        if len(parts) == 2:
+            page = re.fullmatch(r"page-(\d+)", parts[1])
+            if page:
+                return TOKENS_ROUTE, self.tokens_page(parts[0], int(page.group(1)))
+            token_index = self.token_index(parts[1])
+            if token_index is not None:
+                return TRADERS_ROUTE, self.traders_page(token_index)
+            return TRADERS_ROUTE, None
+        return OTHER_ROUTE, None
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockHTTPServer"
+
+    def do_GET(self):
+        started = time.perf_counter()
+        site = self.server.site
+        route, body = site.route(urlsplit(self.path).path)
+
+        time.sleep(site.sample_latency())
+        cleared = f"{CLEARANCE_COOKIE}=" in self.headers.get("Cookie", "")
+
+        if body is None:
+            status, outcome, body = 404, NOT_FOUND, "<title>Not Found</title>"
+        elif site.roll() < site.config.error_rate:
+            status, outcome = 500, ERROR
+            body = "<html><head><title>500 Internal Server Error</title></head></html>"
+        elif not cleared and site.roll() < site.config.interstitial_rate:
+            status, outcome, body = 503, INTERSTITIAL, site.interstitial_page()
+        else:
+            status, outcome = 200, OK
+
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        site.log.add(
+            RequestRecord(
+                route=route,
+                status=status,
+                outcome=outcome,
+                seconds=time.perf_counter() - started,
+                ts=time.time(),
+            )
+        )
+
+    def log_message(self, format, *args):
+        # Requests are recorded in the site's RequestLog instead
+        pass
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], site: MockSite):
+        super().__init__(address, MockRequestHandler)
+        self.site = site
+
+
+class MockServer:
+    """
+    Serves a MockSite from a background thread. Port 0 picks a free port.
+    """
+
+    def __init__(self, site: MockSite, host: str = "127.0.0.1", port: int = 0):
+        self.site = site
+        self.httpd = MockHTTPServer((host, port), site)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="mock-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Mock DexScreener/GMGN server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,107 @@
+import argparse
+import time
+from typing import Optional
+
+import pandas as pd
+from loguru import logger
+
+from ..models.records import TraderTable, WalletStatsRecord, WalletStatsTable
+from ..scraper.dexscreener_tokens_scraper import DexscreenerTokensScraper
+from ..scraper.dexscreener_traders_scraper import DexscreenerTradersScraper
+from ..scraper.wallet_portfolio_scraper import WalletPortfolioScraper
+from .snapshots import TOKENS, TRADERS, WALLETS, SnapshotStore, snapshot_store
+
+# Re-parsing never writes new snapshots
+REPLAY_STORE = SnapshotStore(enabled=False)
+
+
+def replay_tokens(
+    store: SnapshotStore = snapshot_store,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> pd.DataFrame:
+    scraper = DexscreenerTokensScraper(snapshots=REPLAY_STORE)
+    rows = []
+    for snapshot in store.iter(TOKENS, start=start, end=end):
+        for row in scraper._parse_token_rows(snapshot.payload):
+            row["captured_at"] = snapshot.ts
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def replay_traders(
+    store: SnapshotStore = snapshot_store,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> pd.DataFrame:
+    scraper = DexscreenerTradersScraper(snapshots=REPLAY_STORE)
+    table = TraderTable()
+    for snapshot in store.iter(TRADERS, start=start, end=end):
+        payload = snapshot.payload
+        table.extend(
+            scraper._parse_trader_rows(
+                payload["rows"],
+                chain_name=payload["chain_name"],
+                token_address=payload["token_address"],
+            )
+        )
+    return table.to_dataframe()
+
+
+def replay_wallets(
+    store: SnapshotStore = snapshot_store,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> pd.DataFrame:
+    scraper = WalletPortfolioScraper(snapshots=REPLAY_STORE)
+    table = WalletStatsTable()
+    for snapshot in store.iter(WALLETS, start=start, end=end):
+        payload = snapshot.payload
+        table.append(
+            WalletStatsRecord(
+                wallet=payload["wallet"],
+                chain=payload["chain"],
+                days_option=payload["days_option"],
+                **scraper._parse_wallet_stats(payload["texts"]),
+            )
+        )
+    return table.to_dataframe()
+
+
+REPLAYERS = {
+    TOKENS: replay_tokens,
+    TRADERS: replay_traders,
+    WALLETS: replay_wallets,
+}
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Re-parse stored page snapshots without a browser."
+    )
+    parser.add_argument("kind", choices=list(REPLAYERS))
+    parser.add_argument(
+        "--hours",
+        type=float,
+        default=None,
+        help="Only replay snapshots captured within the last N hours",
+    )
+    parser.add_argument("--snapshot-dir", default=snapshot_store.directory)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    start = time.time() - args.hours * 3600 if args.hours else None
+    store = SnapshotStore(directory=args.snapshot_dir, enabled=False)
+
+    started = time.perf_counter()
+    df = REPLAYERS[args.kind](store, start=start)
+    logger.info(
+        f"Replayed {len(df)} {args.kind} rows in {time.perf_counter() - started:.2f}s"
+    )
+
+    output = args.output or f"replay_{args.kind}_{int(time.time())}.csv"
+    df.to_csv(output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from loguru import logger
+
+from ..config import SNAPSHOT_CAPTURE, SNAPSHOT_DIR
+
+TOKENS = "tokens"
+TRADERS = "traders"
+WALLETS = "wallets"
+
+
+@dataclass
+class Snapshot:
+    kind: str
+    url: str
+    ts: float
+    payload: Any
+
+
+class SnapshotStore:
+    """
+    Stores the raw texts extracted from every fetched page as gzip-compressed
+    JSON lines, one file per kind and UTC day, so parsers can be re-run
+    offline.
+    """
+
+    def __init__(self, directory: str = SNAPSHOT_DIR, enabled: bool = SNAPSHOT_CAPTURE):
+        self.directory = directory
+        self.enabled = enabled
+
+    def save(self, kind: str, url: str, payload: Any, ts: Optional[float] = None):
+        if not self.enabled:
+            return
+
+        ts = ts or time.time()
+        path = self._path(kind, ts)
+        line = json.dumps({"url": url, "ts": ts, "payload": payload}) + "\n"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Appending creates a new gzip member, which readers handle fine
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            logger.warning(f"Failed to store snapshot of {url}: {e}")
+
+    def iter(
+        self,
+        kind: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Iterator[Snapshot]:
+        """
+        Yield stored snapshots of a kind between start and end (unix seconds),
+        in capture order.
+        """
+        directory = os.path.join(self.directory, kind)
+        if not os.path.isdir(directory):
+            return
+
+        first_day = self._day(start) if start is not None else None
+        last_day = self._day(end) if end is not None else None
+        for name in sorted(os.listdir(directory)):
+            day = name.split(".")[0]
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if start is not None and record["ts"] < start:
+                        continue
+                    if end is not None and record["ts"] > end:
+                        continue
+                    yield Snapshot(
+                        kind=kind,
+                        url=record["url"],
+                        ts=record["ts"],
+                        payload=record["payload"],
+                    )
+
+    def _path(self, kind: str, ts: float) -> str:
+        return os.path.join(self.directory, kind, f"{self._day(ts)}.jsonl.gz")
+
+    def _day(self, ts: float) -> str:
+        return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+# Shared by all scrapers, capture is switched on with SNAPSHOT_CAPTURE
+snapshot_store = SnapshotStore()
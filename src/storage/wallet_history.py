@@ -0,0 +1,192 @@
+import sqlite3
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ..config import WALLET_CHANGE_THRESHOLDS, WALLET_HISTORY_DB
+
+KEY_COLUMNS = ["wallet", "chain", "days_option"]
+STAT_COLUMNS = [
+    "total_pnl_usd_amount",
+    "total_pnl_pct",
+    "unrealized_usd_profit",
+    "total_usd_cost",
+    "token_avg_usd_cost",
+    "token_avg_realized_usd_profit",
+    "balance",
+    "usd_balance",
+    "pnl_pct",
+    "winrate",
+]
+# Thresholds on these columns are relative to the previous value, all other
+# thresholds are absolute (the remaining stats are already fractions).
+RELATIVE_CHANGE_COLUMNS = {
+    "total_pnl_usd_amount",
+    "unrealized_usd_profit",
+    "total_usd_cost",
+    "balance",
+    "usd_balance",
+}
+
+
+class WalletHistoryStore:
+    """
+    Append-only store of wallet stats snapshots keyed by
+    (wallet, chain, days_option, ts), backed by SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str = WALLET_HISTORY_DB,
+        thresholds: Optional[Dict[str, float]] = None,
+    ):
+        self.thresholds = thresholds or WALLET_CHANGE_THRESHOLDS
+        self.conn = sqlite3.connect(path)
+        stat_defs = ", ".join(f"{column} REAL" for column in STAT_COLUMNS)
+        # WITHOUT ROWID clusters rows by key, so per-wallet range scans are
+        # sequential reads
+        self.conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS wallet_snapshots (
+                wallet TEXT NOT NULL,
+                chain TEXT NOT NULL,
+                days_option TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                {stat_defs},
+                PRIMARY KEY (wallet, chain, days_option, ts)
+            ) WITHOUT ROWID
+            """
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, stats: pd.DataFrame, ts: Optional[int] = None) -> pd.DataFrame:
+        """
+        Append a run's wallet stats and return only the wallets that are new or
+        whose stats moved past the configured thresholds. Rows that failed to
+        scrape are skipped.
+        """
+        ts = int(ts or time.time())
+        snapshots = stats
+        if "error" in snapshots.columns:
+            snapshots = snapshots[snapshots["error"].isna()]
+        snapshots = snapshots[KEY_COLUMNS + STAT_COLUMNS].copy()
+        for column in KEY_COLUMNS:
+            snapshots[column] = snapshots[column].astype(str)
+        snapshots = snapshots.drop_duplicates(subset=KEY_COLUMNS, keep="last")
+        snapshots = snapshots.reset_index(drop=True)
+
+        previous = self.latest(snapshots)
+        changes = self._changes(snapshots, previous)
+
+        rows = [
+            (*row[:3], ts, *row[3:])
+            for row in snapshots.astype(object)
+            .where(snapshots.notna(), None)
+            .itertuples(index=False, name=None)
+        ]
+        placeholders = ", ".join("?" * (len(KEY_COLUMNS) + 1 + len(STAT_COLUMNS)))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO wallet_snapshots VALUES ({placeholders})",
+                rows,
+            )
+
+        logger.info(
+            f"{len(changes)} of {len(snapshots)} wallets changed since last run"
+        )
+        return changes
+
+    def latest(self, keys: pd.DataFrame) -> pd.DataFrame:
+        """
+        Latest stored snapshot for each (wallet, chain, days_option) in `keys`.
+        """
+        # The keys go through a temporary table so one grouped query serves
+        # any number of wallets without hitting SQLite's parameter limit
+        self.conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS snapshot_keys "
+            "(wallet TEXT, chain TEXT, days_option TEXT)"
+        )
+        self.conn.execute("DELETE FROM snapshot_keys")
+        self.conn.executemany(
+            "INSERT INTO snapshot_keys VALUES (?, ?, ?)",
+            keys[KEY_COLUMNS].itertuples(index=False, name=None),
+        )
+        query = f"""
+            SELECT wallet, chain, days_option, ts, {", ".join(STAT_COLUMNS)}
+            FROM wallet_snapshots
+            JOIN (
+                SELECT wallet, chain, days_option, MAX(ts) AS ts
+                FROM wallet_snapshots
+                JOIN snapshot_keys USING (wallet, chain, days_option)
+                GROUP BY wallet, chain, days_option
+            ) USING (wallet, chain, days_option, ts)
+        """
+        rows = self.conn.execute(query).fetchall()
+        return pd.DataFrame(rows, columns=KEY_COLUMNS + ["ts"] + STAT_COLUMNS).astype(
+            {column: "float64" for column in STAT_COLUMNS}
+        )
+
+    def history(
+        self,
+        wallet: str,
+        chain: Optional[str] = None,
+        days_option: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        All snapshots of a wallet within [start, end] (unix seconds), oldest first.
+        """
+        conditions = ["wallet = ?"]
+        params: list = [wallet]
+        for column, value in [("chain", chain), ("days_option", days_option)]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            conditions.append("ts >= ?")
+            params.append(int(start))
+        if end is not None:
+            conditions.append("ts <= ?")
+            params.append(int(end))
+
+        query = (
+            "SELECT * FROM wallet_snapshots WHERE "
+            + " AND ".join(conditions)
+            + " ORDER BY chain, days_option, ts"
+        )
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def _changes(self, current: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+        merged = current.merge(
+            previous.drop(columns="ts"),
+            on=KEY_COLUMNS,
+            how="left",
+            suffixes=("", "_prev"),
+            indicator=True,
+        )
+        is_new = merged["_merge"] == "left_only"
+
+        changed = pd.Series(False, index=merged.index)
+        for column, threshold in self.thresholds.items():
+            new = merged[column].astype("float64")
+            old = merged[f"{column}_prev"].astype("float64")
+            delta = (new - old).abs()
+            # A value appearing or disappearing counts as a change
+            appeared = new.isna() != old.isna()
+            if column in RELATIVE_CHANGE_COLUMNS:
+                delta = delta / old.abs().replace(0, np.nan)
+                # Any move away from zero is a change, e.g. a wallet waking up
+                appeared |= (old == 0) & (new != 0) & new.notna()
+            changed |= (delta > threshold).fillna(False) | appeared
+
+        merged["change"] = np.where(is_new, "new", "changed")
+        changes = merged[is_new | (changed & ~is_new)]
+        prev_columns = [f"{column}_prev" for column in self.thresholds]
+        return changes[KEY_COLUMNS + ["change"] + STAT_COLUMNS + prev_columns]
@@ -0,0 +1,173 @@
+import math
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+from loguru import logger
+
+from ..config import RUN_DEADLINE_MARGIN, RUN_MAX_DURATION, RUN_SCHEDULE
+from .metrics import DEFERRED, DEFERRED_AFTER_FAILURE, ITEM_OUTCOMES
+
+# Stages whose items are deferred once the run budget runs out
+TOKENS = "tokens"
+TRADERS = "traders"
+WALLETS = "wallets"
+
+# Observed item latencies kept per stage, and the percentile used as the
+# estimate, so a few fast items do not make the budget optimistic
+LATENCY_WINDOW = 50
+LATENCY_PERCENTILE = 90
+
+
+def next_slot(now: float, slots: Sequence[str] = RUN_SCHEDULE) -> float:
+    """
+    Timestamp of the first "HH:MM" slot strictly after `now`, local time.
+    """
+    current = datetime.fromtimestamp(now)
+    candidates = []
+    for slot in slots:
+        hour, minute = (int(part) for part in slot.split(":"))
+        at = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if at <= current:
+            at += timedelta(days=1)
+        candidates.append(at.timestamp())
+    return min(candidates)
+
+
+def run_deadline(
+    now: Optional[float] = None,
+    max_duration: Optional[float] = RUN_MAX_DURATION,
+    margin: float = RUN_DEADLINE_MARGIN,
+) -> float:
+    """
+    Deadline of a run started at `now`: `margin` seconds before the next
+    scheduled slot, or earlier when `max_duration` is set. A slot closer than
+    `margin` is skipped, its job starts late once this run is done.
+    """
+    now = time.time() if now is None else now
+    deadline = next_slot(now + margin) - margin
+    if max_duration is not None:
+        deadline = min(deadline, now + max_duration)
+    return deadline
+
+
+class RunBudget:
+    """
+    Wall-clock budget of a pipeline run. Stages record how long each item
+    took, ask before starting the next one whether it is expected to finish
+    before the deadline, and defer what does not fit to the next run.
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        self.reset(deadline)
+
+    def reset(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self.latencies: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=LATENCY_WINDOW)
+        )
+        self.deferred: Dict[str, List[str]] = defaultdict(list)
+        # Deferred items whose last attempt failed, a subset of `deferred`
+        self.deferred_after_failure: Dict[str, List[str]] = defaultdict(list)
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return math.inf
+        return self.deadline - time.time()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def stage_deadline(self, share: float) -> Optional[float]:
+        """
+        Deadline for a stage allowed to use `share` of the remaining time,
+        leaving the rest to the stages after it.
+        """
+        if self.deadline is None:
+            return None
+        return time.time() + max(0.0, self.remaining()) * share
+
+    def observe(self, stage: str, seconds: float):
+        self.latencies[stage].append(seconds)
+
+    def estimate(self, stage: str) -> Optional[float]:
+        """
+        Expected duration of one more item of `stage`, None before the first
+        item finished.
+        """
+        observed = sorted(self.latencies.get(stage, ()))
+        if not observed:
+            return None
+        rank = max(1, math.ceil(LATENCY_PERCENTILE / 100 * len(observed)))
+        return observed[rank - 1]
+
+    def allows(self, stage: str, deadline: Optional[float] = None) -> bool:
+        """
+        Whether one more item of `stage` is expected to finish before the run
+        deadline and the optional stage `deadline`.
+        """
+        limits = [limit for limit in (self.deadline, deadline) if limit is not None]
+        if not limits:
+            return True
+        return time.time() + (self.estimate(stage) or 0) <= min(limits)
+
+    def defer(self, stage: str, items: Iterable[str], after_failure: bool = False):
+        """
+        Leave `items` to the next run. `after_failure` marks items whose retry
+        did not fit, as opposed to items that were never started.
+        """
+        items = list(items)
+        self.deferred[stage].extend(items)
+        if after_failure:
+            self.deferred_after_failure[stage].extend(items)
+        ITEM_OUTCOMES.inc(
+            len(items),
+            stage=stage,
+            outcome=DEFERRED_AFTER_FAILURE if after_failure else DEFERRED,
+        )
+
+    def deferred_frame(self) -> pd.DataFrame:
+        failed = {
+            stage: set(items) for stage, items in self.deferred_after_failure.items()
+        }
+        return pd.DataFrame(
+            [
+                {
+                    "stage": stage,
+                    "item": item,
+                    "after_failure": item in failed.get(stage, ()),
+                }
+                for stage, items in self.deferred.items()
+                for item in items
+            ],
+            columns=["stage", "item", "after_failure"],
+        )
+
+    def report(self) -> dict:
+        """
+        Log and return the deferred item counts and latency estimates.
+        """
+        report = {
+            "deadline": (
+                None
+                if self.deadline is None
+                else datetime.fromtimestamp(self.deadline).isoformat(timespec="seconds")
+            ),
+            "deferred": {stage: len(items) for stage, items in self.deferred.items()},
+            "deferred_after_failure": {
+                stage: len(items)
+                for stage, items in self.deferred_after_failure.items()
+            },
+            "estimates": {
+                stage: round(self.estimate(stage), 1) for stage in self.latencies
+            },
+        }
+        logger.info(f"Run budget: {report}")
+        return report
+
+
+# Budget of the current run, reset by main.run_task; unlimited by default
+run_budget = RunBudget()
@@ -0,0 +1,177 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from loguru import logger
+
+from ..config import (
+    AIMD_DECREASE_FACTOR,
+    AIMD_LATENCY_TARGET,
+    AIMD_MIN_SUCCESS_RATE,
+    AIMD_WINDOW,
+    WALLET_CONCURRENCY_INITIAL,
+    WALLET_CONCURRENCY_MAX,
+    WALLET_CONCURRENCY_MIN,
+)
+from .metrics import CONCURRENCY_LIMIT, IN_FLIGHT, QUEUE_DEPTH
+
+
+class Slot:
+    """
+    One in-flight task. Mark it as a success or failure once the outcome is
+    known, so cleanup work after that is not counted as latency.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.latency: Optional[float] = None
+        self.ok = False
+        self.timeout = False
+        self.cancelled = False
+
+    def success(self):
+        self._finish(ok=True)
+
+    def failure(self, timeout: bool = False):
+        self.timeout = timeout
+        self._finish(ok=False)
+
+    def cancel(self):
+        """
+        Give the slot back without doing the work, e.g. when the task is
+        deferred. Cancelled slots do not count towards the limit decisions.
+        """
+        self.cancelled = True
+        self._finish(ok=False)
+
+    def _finish(self, ok: bool):
+        if self.latency is None:
+            self.latency = time.monotonic() - self.started
+            self.ok = ok
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit driven by additive-increase / multiplicative-decrease.
+
+    After every `window` completed tasks with a healthy success rate and mean
+    latency the limit grows by one. A timeout, or a window whose success rate
+    falls below the threshold, cuts it by `decrease_factor`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        stage: Optional[str] = None,
+        min_limit: int = WALLET_CONCURRENCY_MIN,
+        max_limit: int = WALLET_CONCURRENCY_MAX,
+        initial: int = WALLET_CONCURRENCY_INITIAL,
+        window: int = AIMD_WINDOW,
+        latency_target: float = AIMD_LATENCY_TARGET,
+        min_success_rate: float = AIMD_MIN_SUCCESS_RATE,
+        decrease_factor: float = AIMD_DECREASE_FACTOR,
+    ):
+        self.name = name
+        # Label of the queue, in-flight and limit metrics
+        self.stage = stage or name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.window = window
+        self.latency_target = latency_target
+        self.min_success_rate = min_success_rate
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self.waiting = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+        self._reset_window()
+        self._update_metrics()
+
+    def _update_metrics(self):
+        QUEUE_DEPTH.set(self.waiting, stage=self.stage)
+        IN_FLIGHT.set(self.in_flight, stage=self.stage)
+        CONCURRENCY_LIMIT.set(self.limit, stage=self.stage)
+
+    def _reset_window(self):
+        self._completed = 0
+        self._successes = 0
+        self._latency_sum = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Slot]:
+        async with self._condition:
+            self.waiting += 1
+            self._update_metrics()
+            try:
+                await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            self._update_metrics()
+
+        slot = Slot()
+        try:
+            yield slot
+        except BaseException:
+            slot.failure()
+            raise
+        finally:
+            if slot.latency is None:
+                slot.failure()
+            async with self._condition:
+                self.in_flight -= 1
+                self._record(slot)
+                self._update_metrics()
+                self._condition.notify_all()
+
+    def _record(self, slot: Slot):
+        if slot.cancelled:
+            return
+        if slot.timeout:
+            # Tasks started before the last cut saw the old limit, so a burst
+            # of timeouts only cuts once
+            if slot.started >= self._last_decrease:
+                self._decrease(f"timeout after {slot.latency:.1f}s")
+            return
+
+        self._completed += 1
+        self._successes += int(slot.ok)
+        self._latency_sum += slot.latency
+
+        if self._completed < self.window:
+            return
+
+        success_rate = self._successes / self._completed
+        mean_latency = self._latency_sum / self._completed
+        if success_rate < self.min_success_rate:
+            self._decrease(f"success rate {success_rate:.0%}")
+        elif mean_latency > self.latency_target:
+            # Slow but healthy: hold the limit
+            logger.info(
+                f"{self.name} concurrency held at {self.limit}, "
+                f"mean latency {mean_latency:.1f}s"
+            )
+            self._reset_window()
+        else:
+            self._increase(success_rate, mean_latency)
+
+    def _increase(self, success_rate: float, mean_latency: float):
+        previous = self.limit
+        self.limit = min(self.limit + 1, self.max_limit)
+        if self.limit != previous:
+            logger.info(
+                f"{self.name} concurrency {previous} -> {self.limit} "
+                f"(success rate {success_rate:.0%}, mean latency {mean_latency:.1f}s)"
+            )
+        self._reset_window()
+
+    def _decrease(self, reason: str):
+        previous = self.limit
+        self.limit = max(self.min_limit, math.floor(self.limit * self.decrease_factor))
+        self._last_decrease = time.monotonic()
+        logger.warning(f"{self.name} concurrency {previous} -> {self.limit} ({reason})")
+        self._reset_window()
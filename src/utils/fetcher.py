@@ -0,0 +1,287 @@
+import asyncio
+import gzip
+import http.client
+import json
+import queue
+import threading
+import zlib
+from collections import Counter
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from ..config import HTTP_FAST_PATH, HTTP_POOL_SIZE, HTTP_TIMEOUT
+from .html import HtmlNode, page_title, parse_html
+from .metrics import CLOUDFLARE_CHALLENGES, PAGES_FETCHED
+
+T = TypeVar("T")
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+}
+INTERSTITIAL_TITLES = {"Just a moment...", "Attention Required! | Cloudflare"}
+INTERSTITIAL_STATUSES = {403, 429, 503}
+
+
+class FetchPath(Enum):
+    HTTP = "http"
+    BROWSER = "browser"
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    _document: Optional[HtmlNode] = field(default=None, repr=False)
+
+    @property
+    def text(self) -> str:
+        charset = "utf-8"
+        content_type = self.headers.get("content-type", "")
+        if "charset=" in content_type:
+            charset = content_type.split("charset=")[-1].split(";")[0].strip()
+        return self.body.decode(charset, errors="replace")
+
+    @property
+    def is_json(self) -> bool:
+        return "json" in self.headers.get("content-type", "")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def document(self) -> HtmlNode:
+        if self._document is None:
+            self._document = parse_html(self.text)
+        return self._document
+
+    @property
+    def is_interstitial(self) -> bool:
+        if self.status in INTERSTITIAL_STATUSES:
+            return True
+        if self.is_json:
+            return False
+        return page_title(self.document()) in INTERSTITIAL_TITLES
+
+
+@dataclass
+class FetchResult(Generic[T]):
+    value: T
+    path: FetchPath
+
+
+class HttpClient:
+    """
+    Blocking keep-alive connection pool driven from asyncio through worker
+    threads. Each host gets at most `max_connections` open connections.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_POOL_SIZE,
+        timeout: float = HTTP_TIMEOUT,
+    ):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle: Dict[tuple, queue.LifoQueue] = {}
+        self._slots: Dict[tuple, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    async def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> HttpResponse:
+        return await asyncio.to_thread(self._get, url, headers or {})
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                while not idle.empty():
+                    idle.get_nowait().close()
+
+    def _pool(self, key: tuple) -> tuple[queue.LifoQueue, threading.BoundedSemaphore]:
+        with self._lock:
+            if key not in self._idle:
+                self._idle[key] = queue.LifoQueue()
+                self._slots[key] = threading.BoundedSemaphore(self.max_connections)
+            return self._idle[key], self._slots[key]
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _get(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        idle, slots = self._pool(key)
+        with slots:
+            try:
+                conn = idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = self._connect(*key)
+                reused = False
+
+            keep = False
+            try:
+                try:
+                    response = self._request(conn, path, headers)
+                except (http.client.HTTPException, OSError):
+                    if not reused:
+                        raise
+                    # The server dropped an idle keep-alive connection, retry once
+                    conn.close()
+                    conn = self._connect(*key)
+                    response = self._request(conn, path, headers)
+                keep = response.headers.get("connection", "").lower() != "close"
+            finally:
+                # Failed connections are never returned to the pool
+                if keep:
+                    idle.put(conn)
+                else:
+                    conn.close()
+
+            PAGES_FETCHED.inc(host=parts.netloc, fetch_path=FetchPath.HTTP.value)
+
+        response.url = url
+        return response
+
+    def _request(
+        self,
+        conn: http.client.HTTPConnection,
+        path: str,
+        headers: Dict[str, str],
+    ) -> HttpResponse:
+        conn.request("GET", path, headers={**DEFAULT_HEADERS, **headers})
+        raw = conn.getresponse()
+        body = raw.read()
+        response_headers = {name.lower(): value for name, value in raw.getheaders()}
+
+        encoding = response_headers.get("content-encoding", "")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+
+        return HttpResponse(
+            url="", status=raw.status, headers=response_headers, body=body
+        )
+
+
+class Fetcher:
+    """
+    Serves an item from a plain HTTP request when possible and falls back to
+    the browser when the response is an interstitial or lacks the data.
+    """
+
+    def __init__(
+        self, client: Optional[HttpClient] = None, enabled: bool = HTTP_FAST_PATH
+    ):
+        self.client = client or http_client
+        self.enabled = enabled
+        self.served: Counter = Counter()
+
+    async def fetch(
+        self,
+        url: str,
+        parse_http: Optional[Callable[[HttpResponse], Optional[T]]],
+        fetch_browser: Callable[[], Awaitable[T]],
+    ) -> FetchResult[T]:
+        """
+        `parse_http` returns None when the response does not carry the
+        expected data, which escalates to `fetch_browser`. Pass None for
+        items that can only be served by the browser.
+        """
+        if self.enabled and parse_http is not None:
+            value = await self.fetch_http(url, parse_http)
+            if value is not None:
+                self.served[FetchPath.HTTP] += 1
+                return FetchResult(value=value, path=FetchPath.HTTP)
+
+        value = await fetch_browser()
+        self.served[FetchPath.BROWSER] += 1
+        return FetchResult(value=value, path=FetchPath.BROWSER)
+
+    async def stream(
+        self,
+        url: str,
+        parse_http: Optional[Callable[[HttpResponse], Optional[Sequence[T]]]],
+        stream_browser: Callable[[], AsyncIterator[T]],
+    ) -> AsyncIterator[FetchResult[T]]:
+        """
+        `fetch` for items made of many records, such as a list harvested while
+        scrolling. Records are yielded as they arrive, and the browser stream
+        is closed as soon as the caller stops iterating.
+        """
+        if self.enabled and parse_http is not None:
+            values = await self.fetch_http(url, parse_http)
+            if values is not None:
+                self.served[FetchPath.HTTP] += 1
+                for value in values:
+                    yield FetchResult(value=value, path=FetchPath.HTTP)
+                return
+
+        self.served[FetchPath.BROWSER] += 1
+        async with aclosing(stream_browser()) as values:
+            async for value in values:
+                yield FetchResult(value=value, path=FetchPath.BROWSER)
+
+    async def fetch_http(
+        self,
+        url: str,
+        parse_http: Callable[[HttpResponse], Optional[T]],
+    ) -> Optional[T]:
+        try:
+            response = await self.client.get(url)
+        except Exception as e:
+            logger.info(f"HTTP fetch of {url} failed ({e}), using browser")
+            return None
+
+        if response.is_interstitial:
+            CLOUDFLARE_CHALLENGES.inc(
+                host=urlsplit(url).netloc, fetch_path=FetchPath.HTTP.value
+            )
+            logger.info(f"HTTP fetch of {url} hit an interstitial, using browser")
+            return None
+
+        try:
+            value = parse_http(response)
+        except Exception as e:
+            logger.info(f"Could not parse HTTP response of {url} ({e}), using browser")
+            return None
+
+        if value is None:
+            logger.info(
+                f"HTTP response of {url} lacks the expected data, using browser"
+            )
+        return value
+
+
+# Keep-alive connections are shared by all scrapers of the process
+http_client = HttpClient()
@@ -0,0 +1,204 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional
+
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+BLOCK_TAGS = {
+    "div",
+    "p",
+    "tr",
+    "li",
+    "ul",
+    "ol",
+    "table",
+    "section",
+    "header",
+    "footer",
+    "main",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "br",
+}
+SKIP_TEXT_TAGS = {"script", "style", "noscript", "template"}
+XPATH_STEP = re.compile(r"^(?P<tag>[\w*]+)(?:\[(?P<pred>[^\]]+)\])?$")
+
+
+class HtmlNode:
+    """
+    Minimal DOM node, enough to run the scrapers' selectors on static HTML.
+    """
+
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List["HtmlNode | str"] = []
+        self.parent = parent
+
+    @property
+    def elements(self) -> List["HtmlNode"]:
+        return [child for child in self.children if isinstance(child, HtmlNode)]
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attrs.get("class", "").split()
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.attrs.get(name, default)
+
+    def iter(self) -> Iterator["HtmlNode"]:
+        for child in self.elements:
+            yield child
+            yield from child.iter()
+
+    def find_all(self, tag: str, classes: tuple = ()) -> List["HtmlNode"]:
+        return [
+            node
+            for node in self.iter()
+            if (tag == "*" or node.tag == tag)
+            and all(cls in node.classes for cls in classes)
+        ]
+
+    def find(self, tag: str, classes: tuple = ()) -> Optional["HtmlNode"]:
+        for node in self.find_all(tag, classes):
+            return node
+        return None
+
+    def inner_text(self) -> str:
+        """
+        Approximate the browser's innerText: block elements start new lines.
+        """
+        parts: List[str] = []
+        self._collect_text(parts)
+        lines = [
+            re.sub(r"[ \t\r\f\v]+", " ", line).strip()
+            for line in "".join(parts).split("\n")
+        ]
+        return "\n".join(line for line in lines if line)
+
+    def _collect_text(self, parts: List[str]):
+        if self.tag in SKIP_TEXT_TAGS:
+            return
+        block = self.tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        for child in self.children:
+            if isinstance(child, HtmlNode):
+                child._collect_text(parts)
+            else:
+                parts.append(child.replace("\n", " "))
+        if block:
+            parts.append("\n")
+
+    def xpath(self, path: str) -> Optional["HtmlNode"]:
+        """
+        Evaluate the absolute XPaths used by the scrapers, of the form
+        `//*[@id='x']/div/div[2]`. Only tag steps, `@id` and positional
+        predicates are supported.
+        """
+        path = path.removeprefix("xpath=")
+        if not path.startswith("//"):
+            return None
+        first, *steps = path[2:].split("/")
+        match = XPATH_STEP.match(first)
+        if not match:
+            return None
+
+        candidates = [
+            node
+            for node in self.iter()
+            if _matches_tag(node, match.group("tag"))
+            and _matches_attr(node, match.group("pred"))
+        ]
+        if not candidates:
+            return None
+        node = candidates[0]
+
+        for step in steps:
+            match = XPATH_STEP.match(step)
+            if not match:
+                return None
+            children = [
+                child
+                for child in node.elements
+                if _matches_tag(child, match.group("tag"))
+            ]
+            pred = match.group("pred")
+            index = int(pred) - 1 if pred and pred.isdigit() else 0
+            if index >= len(children):
+                return None
+            node = children[index]
+        return node
+
+
+def _matches_tag(node: HtmlNode, tag: str) -> bool:
+    return tag == "*" or node.tag == tag
+
+
+def _matches_attr(node: HtmlNode, pred: Optional[str]) -> bool:
+    if not pred:
+        return True
+    match = re.match(r"@(\w+)\s*=\s*['\"](.*)['\"]", pred)
+    if not match:
+        return False
+    return node.get(match.group(1)) == match.group(2)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlNode("#document", {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = HtmlNode(tag, {key: value or "" for key, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = HtmlNode(tag, {key: value or "" for key, value in attrs}, self.current)
+        self.current.children.append(node)
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed tags by unwinding to the matching open element
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(text: str) -> HtmlNode:
+    builder = _TreeBuilder()
+    builder.feed(text)
+    builder.close()
+    return builder.root
+
+
+def page_title(root: HtmlNode) -> str:
+    title = root.find("title")
+    return title.inner_text() if title is not None else ""
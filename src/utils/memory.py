@@ -0,0 +1,163 @@
+import os
+import resource
+import sys
+from dataclasses import dataclass
+from enum import Enum
+
+from loguru import logger
+
+from ..config import MEMORY_BROWSER_RECYCLE_MB, MEMORY_CONTEXT_RECYCLE_MB
+
+PROC_DIR = "/proc"
+MB = 1024 * 1024
+
+
+class MemoryAction(Enum):
+    NONE = "none"
+    RECYCLE_CONTEXT = "recycle_context"
+    RECYCLE_BROWSER = "recycle_browser"
+
+
+@dataclass
+class MemorySample:
+    python_rss: int
+    browser_rss: int
+
+    @property
+    def total_rss(self) -> int:
+        return self.python_rss + self.browser_rss
+
+
+def _page_size() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return 4096
+
+
+def _read_rss(pid: int) -> int:
+    """
+    Read the resident set size of a process in bytes from /proc/<pid>/statm.
+    """
+    try:
+        with open(f"{PROC_DIR}/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _page_size()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _descendant_pids(root_pid: int) -> list[int]:
+    """
+    Collect all descendants of a process (Chromium spawns a tree of renderers).
+    """
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir(PROC_DIR):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"{PROC_DIR}/{entry}/stat") as f:
+                stat = f.read()
+            # The command name may contain spaces, so split after the last ')'
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    pids = []
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def sample_memory() -> MemorySample:
+    """
+    Sample the RSS of this Python process and of all its child processes
+    (the Playwright driver and Chromium).
+    """
+    pid = os.getpid()
+    if not os.path.isdir(PROC_DIR):
+        # No procfs (e.g. macOS): fall back to the peak RSS of this process
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            max_rss *= 1024
+        return MemorySample(python_rss=max_rss, browser_rss=0)
+
+    browser_rss = sum(_read_rss(child) for child in _descendant_pids(pid))
+    return MemorySample(python_rss=_read_rss(pid), browser_rss=browser_rss)
+
+
+class MemoryGovernor:
+    """
+    Tracks memory usage of the scraper process tree and decides when browser
+    contexts or the whole browser should be recycled.
+    """
+
+    def __init__(
+        self,
+        context_limit_mb: int = MEMORY_CONTEXT_RECYCLE_MB,
+        browser_limit_mb: int = MEMORY_BROWSER_RECYCLE_MB,
+    ):
+        self.context_limit = context_limit_mb * MB
+        self.browser_limit = browser_limit_mb * MB
+        self.reset()
+
+    def reset(self):
+        self.peak_python_rss = 0
+        self.peak_browser_rss = 0
+        self.peak_total_rss = 0
+        self.context_recycles = 0
+        self.browser_recycles = 0
+        self.last_sample: MemorySample | None = None
+
+    def sample(self) -> MemorySample:
+        sample = sample_memory()
+        self.peak_python_rss = max(self.peak_python_rss, sample.python_rss)
+        self.peak_browser_rss = max(self.peak_browser_rss, sample.browser_rss)
+        self.peak_total_rss = max(self.peak_total_rss, sample.total_rss)
+        self.last_sample = sample
+        return sample
+
+    def check(self) -> MemoryAction:
+        """
+        Take a fresh sample and return the action required to stay below the
+        configured thresholds. Only the browser process tree is compared, since
+        recycling contexts or the browser cannot release Python memory.
+        """
+        sample = self.sample()
+        if sample.browser_rss >= self.browser_limit:
+            self.browser_recycles += 1
+            logger.warning(
+                f"Browser memory {sample.browser_rss / MB:.0f} MB exceeds browser limit "
+                f"({self.browser_limit / MB:.0f} MB), recycling browser"
+            )
+            return MemoryAction.RECYCLE_BROWSER
+        if sample.browser_rss >= self.context_limit:
+            self.context_recycles += 1
+            logger.info(
+                f"Browser memory {sample.browser_rss / MB:.0f} MB exceeds context limit "
+                f"({self.context_limit / MB:.0f} MB), recycling context"
+            )
+            return MemoryAction.RECYCLE_CONTEXT
+        return MemoryAction.NONE
+
+    def report(self) -> dict:
+        """
+        Log and return the high-water marks collected since the last reset.
+        """
+        self.sample()
+        report = {
+            "peak_python_rss_mb": round(self.peak_python_rss / MB, 1),
+            "peak_browser_rss_mb": round(self.peak_browser_rss / MB, 1),
+            "peak_total_rss_mb": round(self.peak_total_rss / MB, 1),
+            "context_recycles": self.context_recycles,
+            "browser_recycles": self.browser_recycles,
+        }
+        logger.info(f"Memory high-water marks: {report}")
+        return report
+
+
+# Shared by all scrapers of a run, reset at the start of every scheduled run
+memory_governor = MemoryGovernor()
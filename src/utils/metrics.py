@@ -0,0 +1,378 @@
+import abc
+import math
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from ..config import METRICS_HOST, METRICS_PORT
+from .memory import sample_memory
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+CLOUDFLARE_WAIT_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 45, 60)
+
+# Outcomes of an item attempt in ITEM_OUTCOMES
+SUCCESS = "success"
+RETRY = "retry"
+FAILURE = "failure"
+DEFERRED = "deferred"
+# Retried after a failure, but the retry no longer fit into the run budget
+DEFERRED_AFTER_FAILURE = "deferred_after_failure"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(abc.ABC):
+    """
+    A named metric with a fixed set of label names, in the Prometheus text
+    exposition format. Updates may come from any thread.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """
+        Yield (sample name, labels, value) for every exposed series.
+        """
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class CounterMetric(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, self._labels(key), value
+
+
+class Gauge(Metric):
+    """
+    A value that goes up and down. With `function` the value is read when
+    the metrics are scraped; it returns a number, or a mapping of label
+    value tuples to numbers.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], object]] = None,
+    ):
+        super().__init__(name, help, labelnames)
+        self.function = function
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self.function is not None:
+            try:
+                values = self.function()
+            except Exception as e:
+                logger.warning(f"Could not collect metric {self.name}: {e}")
+                return
+            if not isinstance(values, dict):
+                values = {(): values}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, self._labels(key), value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = CLOUDFLARE_WAIT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: bucket counts (not cumulative), sum, count
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self):
+        with self._lock:
+            values = {
+                key: (list(counts), total, count)
+                for key, (counts, total, count) in self._values.items()
+            }
+        for key, (counts, total, count) in sorted(values.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    {**labels, "le": _format_value(bound)},
+                    cumulative,
+                )
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> CounterMetric:
+        return self.register(CounterMetric(name, help, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], object]] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, help, labelnames, function))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = CLOUDFLARE_WAIT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Live BrowserSession objects, added by the sessions themselves
+browser_sessions: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _browser_contexts() -> float:
+    return sum(session.open_contexts for session in list(browser_sessions))
+
+
+def _process_rss() -> Dict[LabelValues, float]:
+    sample = sample_memory()
+    return {("python",): sample.python_rss, ("browser",): sample.browser_rss}
+
+
+registry = MetricsRegistry()
+
+PAGES_FETCHED = registry.counter(
+    "snuffy_pages_fetched_total",
+    "Pages requested, per host and fetch path (http or browser).",
+    ["host", "fetch_path"],
+)
+CLOUDFLARE_CHALLENGES = registry.counter(
+    "snuffy_cloudflare_challenges_total",
+    "Interstitial challenge pages received, per host and fetch path.",
+    ["host", "fetch_path"],
+)
+CLOUDFLARE_WAIT = registry.histogram(
+    "snuffy_cloudflare_wait_seconds",
+    "Time browser pages spent on a Cloudflare challenge until it cleared or timed out.",
+    ["host"],
+)
+STAGE_ITEMS = registry.counter(
+    "snuffy_stage_items_total",
+    "Items produced per pipeline stage (tokens, trader rows, wallets).",
+    ["stage"],
+)
+ITEM_OUTCOMES = registry.counter(
+    "snuffy_item_outcomes_total",
+    "Item attempts per stage by outcome: success, retry, failure, deferred or "
+    "deferred_after_failure.",
+    ["stage", "outcome"],
+)
+QUEUE_DEPTH = registry.gauge(
+    "snuffy_queue_depth",
+    "Items of a stage waiting to be started.",
+    ["stage"],
+)
+IN_FLIGHT = registry.gauge(
+    "snuffy_in_flight",
+    "Items of a stage currently being processed.",
+    ["stage"],
+)
+CONCURRENCY_LIMIT = registry.gauge(
+    "snuffy_concurrency_limit",
+    "Current adaptive concurrency limit of a stage.",
+    ["stage"],
+)
+RUN_DURATION = registry.gauge(
+    "snuffy_last_run_duration_seconds",
+    "Wall-clock duration of the last finished run.",
+)
+RUN_FINISHED = registry.gauge(
+    "snuffy_last_run_finished_timestamp_seconds",
+    "Unix time at which the last run finished.",
+)
+BROWSER_CONTEXTS = registry.gauge(
+    "snuffy_browser_contexts",
+    "Browser contexts currently open across all browser sessions.",
+    function=_browser_contexts,
+)
+PROCESS_RSS = registry.gauge(
+    "snuffy_process_rss_bytes",
+    "Resident memory of this process and of its browser child processes.",
+    ["process"],
+    function=_process_rss,
+)
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    server: "MetricsHTTPServer"
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        payload = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], registry: MetricsRegistry):
+        super().__init__(address, MetricsRequestHandler)
+        self.registry = registry
+
+
+class MetricsServer:
+    """
+    Serves the registry on http://host:port/metrics from a background thread.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = registry,
+        host: str = METRICS_HOST,
+        port: int = METRICS_PORT,
+    ):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.httpd: Optional[MetricsHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsServer":
+        try:
+            self.httpd = MetricsHTTPServer((self.host, self.port), self.registry)
+        except OSError as e:
+            # Scraping goes on without metrics, e.g. when the port is taken
+            logger.error(
+                f"Could not start metrics server on {self.host}:{self.port}: {e}"
+            )
+            return self
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        if self.httpd is None:
+            return
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
+        self.httpd = None
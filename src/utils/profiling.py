@@ -0,0 +1,227 @@
+import asyncio
+import contextvars
+import csv
+import os
+import signal
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Optional, TypeVar
+
+from loguru import logger
+
+from ..config import (
+    LOOP_LAG_INTERVAL,
+    LOOP_LAG_THRESHOLD,
+    PROFILE_DIR,
+    PROFILE_SAMPLE_INTERVAL,
+    PROFILING,
+)
+
+T = TypeVar("T")
+
+TOKEN_PARSE = "token_parse"
+TRADER_PARSE = "trader_parse"
+WALLET_PARSE = "wallet_parse"
+DATAFRAME_BUILD = "dataframe_build"
+
+_current_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "profiling_stage", default=None
+)
+
+
+class Profiler:
+    """
+    Opt-in event-loop lag monitor and per-stage sampling CPU profiler.
+
+    Loop lag is measured by a task that sleeps for a fixed interval and
+    records how late it wakes up. Stages are named blocks of synchronous
+    work; the SIGPROF timer sampling the Python stack is only armed while one
+    is active, and stages blocking longer than the threshold are reported.
+    Everything is written to a directory per run in collapsed-stack and CSV
+    form.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = PROFILING,
+        output_dir: str = PROFILE_DIR,
+        lag_interval: float = LOOP_LAG_INTERVAL,
+        lag_threshold: float = LOOP_LAG_THRESHOLD,
+        sample_interval: float = PROFILE_SAMPLE_INTERVAL,
+    ):
+        self.enabled = enabled
+        self.output_dir = output_dir
+        self.lag_interval = lag_interval
+        self.lag_threshold = lag_threshold
+        self.sample_interval = sample_interval
+        self._reset()
+
+    def _reset(self):
+        self.run_dir: Optional[str] = None
+        self.max_lag = 0.0
+        self.lag_events = 0
+        self.samples: Dict[str, Counter] = defaultdict(Counter)
+        self.stage_calls: Counter = Counter()
+        self.stage_wall: Dict[str, float] = defaultdict(float)
+        self.stage_cpu: Dict[str, float] = defaultdict(float)
+        self._lag_task: Optional[asyncio.Task] = None
+        self._lag_file = None
+        self._slow_file = None
+        # Nesting depth of active stages, the sampler runs while it is > 0
+        self._active_stages = 0
+        self._can_sample = False
+
+    async def profile(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine with lag monitoring and stage sampling switched on.
+        """
+        if not self.enabled:
+            return await coro
+
+        self.start()
+        try:
+            return await coro
+        finally:
+            await self.stop()
+
+    def start(self):
+        self._reset()
+        self.run_dir = os.path.join(self.output_dir, f"run_{int(time.time())}")
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        self._lag_file = open(os.path.join(self.run_dir, "loop_lag.csv"), "w")
+        self._lag_file.write("ts,lag_seconds\n")
+        self._slow_file = open(os.path.join(self.run_dir, "slow_stages.csv"), "w")
+        self._slow_file.write("ts,stage,seconds\n")
+        self._lag_task = asyncio.create_task(self._watch_lag())
+
+        # The handler is installed once, the timer is armed by stage()
+        self._can_sample = hasattr(signal, "SIGPROF")
+        if self._can_sample:
+            signal.signal(signal.SIGPROF, self._sample)
+        else:
+            logger.warning("SIGPROF is not available, stages are timed but not sampled")
+
+        logger.info(f"Profiling enabled, writing results to {self.run_dir}")
+
+    async def stop(self):
+        if self._can_sample:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+            self._can_sample = False
+
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+        if self._lag_file is not None:
+            self._lag_file.close()
+        if self._slow_file is not None:
+            self._slow_file.close()
+
+        self._write_results()
+        logger.info(
+            f"Max event loop lag {self.max_lag * 1000:.0f} ms, "
+            f"{self.lag_events} stalls over {self.lag_threshold * 1000:.0f} ms"
+        )
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Attribute the enclosed synchronous work to a named stage.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        token = _current_stage.set(name)
+        self._arm()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            self._disarm()
+            self.stage_calls[name] += 1
+            self.stage_wall[name] += wall
+            self.stage_cpu[name] += time.process_time() - cpu_start
+            _current_stage.reset(token)
+            if wall > self.lag_threshold:
+                self._record_slow_stage(name, wall)
+
+    def _arm(self):
+        self._active_stages += 1
+        if self._can_sample and self._active_stages == 1:
+            signal.setitimer(
+                signal.ITIMER_PROF, self.sample_interval, self.sample_interval
+            )
+
+    def _disarm(self):
+        self._active_stages -= 1
+        if self._can_sample and self._active_stages == 0:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+
+    def _record_slow_stage(self, name: str, seconds: float):
+        # Stages run synchronously on the event loop, so they block it
+        logger.warning(
+            f"Stage {name} blocked the event loop for {seconds * 1000:.0f} ms"
+        )
+        if self._slow_file is not None:
+            self._slow_file.write(f"{time.time():.3f},{name},{seconds:.6f}\n")
+
+    async def _watch_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - started - self.lag_interval)
+            self.max_lag = max(self.max_lag, lag)
+            self._lag_file.write(f"{time.time():.3f},{lag:.6f}\n")
+            if lag > self.lag_threshold:
+                self.lag_events += 1
+                logger.warning(f"Event loop stalled for {lag * 1000:.0f} ms")
+
+    def _sample(self, signum, frame):
+        stage = _current_stage.get()
+        if stage is None or frame is None:
+            return
+
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+            )
+            frame = frame.f_back
+        self.samples[stage][";".join(reversed(stack))] += 1
+
+    def _write_results(self):
+        with open(os.path.join(self.run_dir, "stages.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["stage", "calls", "wall_seconds", "cpu_seconds", "samples"]
+            )
+            for name in sorted(self.stage_calls):
+                writer.writerow(
+                    [
+                        name,
+                        self.stage_calls[name],
+                        round(self.stage_wall[name], 6),
+                        round(self.stage_cpu[name], 6),
+                        sum(self.samples[name].values()),
+                    ]
+                )
+
+        # Collapsed stacks, readable by flamegraph.pl and speedscope
+        for name, stacks in self.samples.items():
+            with open(os.path.join(self.run_dir, f"profile_{name}.folded"), "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+
+# Shared by all scrapers, switched on with PROFILING in config
+profiler = Profiler()
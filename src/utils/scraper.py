@@ -2,20 +2,160 @@ import asyncio
 import math
 import random
 import time
+from urllib.parse import urlsplit
 
-from patchright.async_api import Browser, Page, Playwright
+from loguru import logger
+from patchright.async_api import Browser, BrowserContext, Page, Playwright
+
+from .. import config
+from .fetcher import FetchPath
+from .memory import MemoryAction, MemoryGovernor, memory_governor
+from .metrics import (
+    CLOUDFLARE_CHALLENGES,
+    CLOUDFLARE_WAIT,
+    PAGES_FETCHED,
+    browser_sessions,
+)
 
 MS_TIMEOUT = 60000
 
 
 async def setup_browser(playwright: Playwright | None) -> Browser:
     return await playwright.chromium.launch(
-        headless=False,
+        headless=config.BROWSER_HEADLESS,
         timeout=MS_TIMEOUT,
         args=["--window-position=20,1"],
     )
 
 
+class BrowserSession:
+    """
+    Owns a browser and the contexts created from it. Every released context is
+    checked against the memory governor. Past the browser limit, short-lived
+    contexts drain and the browser is relaunched once none is open, while
+    pooled contexts move to a fresh browser and the old one is closed when
+    its last context is returned.
+    """
+
+    def __init__(
+        self,
+        playwright: Playwright,
+        governor: MemoryGovernor = memory_governor,
+    ):
+        self.playwright = playwright
+        self.governor = governor
+        self.browser: Browser | None = None
+        # Browsers replaced under memory pressure that still have contexts
+        self._retired: list[Browser] = []
+        self.open_contexts = 0
+        self._restart_pending = False
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self._start_lock = asyncio.Lock()
+        browser_sessions.add(self)
+
+    async def start(self) -> "BrowserSession":
+        self.browser = await setup_browser(self.playwright)
+        return self
+
+    async def new_context(self, **kwargs) -> BrowserContext:
+        # Hold back new work while a browser restart is pending
+        await self._ready.wait()
+        # The browser is launched on first use, so sessions whose items are
+        # all served over plain HTTP never start Chromium
+        async with self._start_lock:
+            if self.browser is None:
+                await self.start()
+        context = await self.browser.new_context(**kwargs)
+        self.open_contexts += 1
+        return context
+
+    async def release(
+        self,
+        context: BrowserContext,
+        keep: bool = False,
+        **kwargs,
+    ) -> BrowserContext | None:
+        """
+        Hand back a context. Short-lived contexts are closed and None is
+        returned. With `keep=True` the context is returned for reuse, or
+        replaced by a fresh one (created with `kwargs`) when memory is above
+        the governor's thresholds or its browser has been retired.
+        """
+        action = self.governor.check()
+
+        if keep:
+            if (
+                action == MemoryAction.RECYCLE_BROWSER
+                and context.browser is self.browser
+            ):
+                # Pooled contexts never all become idle, so instead of waiting
+                # for them to drain the browser is swapped for a fresh one
+                self._retire_browser()
+            if action == MemoryAction.NONE and context.browser is self.browser:
+                return context
+            await self.close_context(context)
+            return await self.new_context(**kwargs)
+
+        await self.close_context(context)
+
+        if action == MemoryAction.RECYCLE_BROWSER:
+            self._restart_pending = True
+            self._ready.clear()
+
+        if self._restart_pending and self.open_contexts == 0:
+            await self._restart()
+        return None
+
+    async def close_context(self, context: BrowserContext):
+        browser = context.browser
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context: {e}")
+        self.open_contexts -= 1
+
+        if browser in self._retired and not browser.contexts:
+            self._retired.remove(browser)
+            await self._close_browser(browser)
+
+    def _retire_browser(self):
+        if self.browser is None:
+            return
+        logger.info("Moving pooled contexts to a fresh browser to release memory")
+        self._retired.append(self.browser)
+        # The next new_context launches a new browser
+        self.browser = None
+
+    async def _restart(self):
+        logger.info("Relaunching browser to release memory")
+        try:
+            await self.close()
+            await self.start()
+        except Exception as e:
+            # Not raised, release() runs in cleanup code. The browser is left
+            # unset, so the next new_context launches it again.
+            logger.error(f"Failed to relaunch browser: {e}")
+            self.browser = None
+        finally:
+            self._restart_pending = False
+            self._ready.set()
+
+    async def _close_browser(self, browser: Browser):
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser: {e}")
+
+    async def close(self):
+        for browser in self._retired:
+            await self._close_browser(browser)
+        self._retired.clear()
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+
+
 async def human_random_behaviour(page: Page):
     # Natural reading pause
     await human_delay(0.4, 0.8)
@@ -64,8 +204,8 @@ async def human_random_behaviour(page: Page):
             await human_delay(0.1, 0.3)
 
 
-async def human_delay(self, min_delay=0.1, max_delay=0.5):
-    delay = random.uniform(min_delay, max_delay)
+async def human_delay(min_delay=0.1, max_delay=0.5):
+    delay = random.uniform(min_delay, max_delay) * config.HUMAN_DELAY_SCALE
     await asyncio.sleep(delay)
 
 
@@ -74,8 +214,18 @@ async def wait_for_cloudflare(
 ):
     timeout = 60
     start_time = time.time()
+    # Called after every navigation, so browser page loads are counted here
+    host = urlsplit(page.url).netloc
+    PAGES_FETCHED.inc(host=host, fetch_path=FetchPath.BROWSER.value)
+    challenged = False
     while await page.title() == "Just a moment...":
+        if not challenged:
+            challenged = True
+            CLOUDFLARE_CHALLENGES.inc(host=host, fetch_path=FetchPath.BROWSER.value)
         if time.time() - start_time > timeout:
+            CLOUDFLARE_WAIT.observe(time.time() - start_time, host=host)
             raise TimeoutError("Cloudflare check timeout after 60 seconds")
         await asyncio.sleep(1)
+    if challenged:
+        CLOUDFLARE_WAIT.observe(time.time() - start_time, host=host)
     await page.wait_for_load_state("domcontentloaded", timeout=MS_TIMEOUT)
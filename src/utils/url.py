@@ -1,5 +1,8 @@
+from .. import config
+
+
 def get_gmgn_url(addr: str, chain_name: str = "sol") -> str:
-    return f"https://gmgn.ai/{chain_name}/address/{addr}"
+    return f"{config.GMGN_BASE_URL}/{chain_name}/address/{addr}"
 
 
 def get_dexscreener_url(
@@ -16,4 +19,8 @@ def get_dexscreener_url(
     if filter_args:
         postfix = f"?{filter_args}"
 
-    return f"https://dexscreener.com/{chain_name}{page_str}{postfix}"
+    return f"{config.DEXSCREENER_BASE_URL}/{chain_name}{page_str}{postfix}"
+
+
+def get_dexscreener_token_url(chain_name: str, token_address: str) -> str:
+    return f"{config.DEXSCREENER_BASE_URL}/{chain_name}/{token_address}"
@@ -0,0 +1,39 @@
+import pytest
+
+from src.simulation.mock_server import Latency, MockServer, MockSite, MockSiteConfig
+
+
+@pytest.fixture
+def mock_server():
+    """
+    Factory for a running mock DexScreener/GMGN server, stopped after the test.
+    """
+    servers = []
+
+    def start(**config) -> MockServer:
+        config.setdefault("latency", Latency("fixed", 0, 0))
+        server = MockServer(MockSite(MockSiteConfig(**config))).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def launches(monkeypatch):
+    """
+    Browsers launched by BrowserSession, faked so no Chromium is needed.
+    """
+    from src.utils import scraper
+    from tests.fakes import FakeBrowser
+
+    browsers = []
+
+    async def setup_browser(playwright):
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    monkeypatch.setattr(scraper, "setup_browser", setup_browser)
+    return browsers
@@ -0,0 +1,51 @@
+from src.utils.memory import MemoryAction
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+        self.browser.contexts.remove(self)
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.created = []
+        self.closed = False
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        self.created.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeGovernor:
+    def __init__(self):
+        self.action = MemoryAction.NONE
+
+    def check(self):
+        return self.action
+
+
+class FakePlaywright:
+    """
+    Stands in for `async_playwright()`; browsers come from `setup_browser`.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+async def no_wait(*args, **kwargs):
+    pass
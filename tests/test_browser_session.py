@@ -0,0 +1,54 @@
+import asyncio
+
+from src.utils.memory import MemoryAction
+from src.utils.scraper import BrowserSession
+from tests.fakes import FakeGovernor
+
+
+def test_pooled_contexts_move_to_fresh_browser(launches):
+    async def run():
+        governor = FakeGovernor()
+        session = BrowserSession(None, governor)
+        pool = [await session.new_context() for _ in range(2)]
+        old = session.browser
+
+        governor.action = MemoryAction.RECYCLE_BROWSER
+        pool[0] = await session.release(pool[0], keep=True)
+        governor.action = MemoryAction.NONE
+        assert pool[0].browser is session.browser is not old
+        assert not old.closed
+
+        # The last context of the retired browser is replaced, then it closes
+        pool[1] = await session.release(pool[1], keep=True)
+        assert pool[1].browser is session.browser
+        assert old.closed
+        assert session.open_contexts == 2
+        assert len(launches) == 2
+
+    asyncio.run(run())
+
+
+def test_failed_restart_unblocks_waiters(launches, monkeypatch):
+    async def run():
+        governor = FakeGovernor()
+        session = BrowserSession(None, governor)
+        context = await session.new_context()
+        start = session.start
+
+        async def failing_start():
+            raise RuntimeError("launch failed")
+
+        monkeypatch.setattr(session, "start", failing_start)
+        governor.action = MemoryAction.RECYCLE_BROWSER
+        # Released from cleanup code, so the failure is logged, not raised
+        assert await session.release(context) is None
+        assert session._ready.is_set()
+        assert session.browser is None
+
+        # The next context relaunches the browser
+        monkeypatch.setattr(session, "start", start)
+        governor.action = MemoryAction.NONE
+        context = await session.new_context()
+        assert context.browser is session.browser is launches[-1]
+
+    asyncio.run(run())
@@ -0,0 +1,92 @@
+import time
+from datetime import datetime
+from functools import partial
+
+import pytest
+
+from src.utils import budget as budget_module
+from src.utils.budget import WALLETS, RunBudget, next_slot, run_deadline
+from src.utils.metrics import DEFERRED, DEFERRED_AFTER_FAILURE, ITEM_OUTCOMES
+
+
+def at(hour: int, minute: int = 0, day: int = 1) -> float:
+    return datetime(2024, 1, day, hour, minute).timestamp()
+
+
+def outcomes(outcome: str) -> float:
+    return dict(
+        (labels["outcome"], value)
+        for _, labels, value in ITEM_OUTCOMES.samples()
+        if labels["stage"] == WALLETS
+    ).get(outcome, 0)
+
+
+def test_next_slot_is_strictly_after_now():
+    slots = ["08:00", "20:00"]
+    assert next_slot(at(7, 59), slots) == at(8)
+    assert next_slot(at(8), slots) == at(20)
+    assert next_slot(at(21), slots) == at(8, day=2)
+
+
+def test_run_deadline_keeps_margin_and_max_duration(monkeypatch):
+    monkeypatch.setattr(
+        budget_module, "next_slot", partial(next_slot, slots=["08:00", "20:00"])
+    )
+    now = at(10)
+    assert run_deadline(now, None, 600) == at(19, 50)
+    assert run_deadline(now, 3600, 600) == now + 3600
+    # A slot closer than the margin is skipped
+    assert run_deadline(at(19, 55), None, 600) == at(7, 50, day=2)
+
+
+def test_estimate_is_p90_of_recent_latencies():
+    budget = RunBudget()
+    assert budget.estimate(WALLETS) is None
+    for seconds in range(1, 11):
+        budget.observe(WALLETS, seconds)
+    assert budget.estimate(WALLETS) == 9
+    # Unobserved stages do not create empty entries
+    budget.estimate("other")
+    assert "other" not in budget.latencies
+
+
+def test_allows_expected_finish_before_deadline():
+    assert RunBudget().allows(WALLETS)
+
+    budget = RunBudget(deadline=time.time() + 30)
+    assert budget.allows(WALLETS)
+    budget.observe(WALLETS, 60)
+    assert not budget.allows(WALLETS)
+
+    budget = RunBudget(deadline=time.time() + 3600)
+    budget.observe(WALLETS, 60)
+    assert not budget.allows(WALLETS, deadline=time.time() + 30)
+    assert budget.stage_deadline(0.5) == pytest.approx(time.time() + 1800, abs=1)
+    assert RunBudget().stage_deadline(0.5) is None
+
+
+def test_deferred_after_failure_is_recorded_separately():
+    budget = RunBudget()
+    never_started = outcomes(DEFERRED)
+    after_failure = outcomes(DEFERRED_AFTER_FAILURE)
+
+    budget.defer(WALLETS, ["a", "b"])
+    budget.defer(WALLETS, ["c"], after_failure=True)
+
+    assert outcomes(DEFERRED) == never_started + 2
+    assert outcomes(DEFERRED_AFTER_FAILURE) == after_failure + 1
+    frame = budget.deferred_frame()
+    assert frame["item"].tolist() == ["a", "b", "c"]
+    assert frame["after_failure"].tolist() == [False, False, True]
+
+    report = budget.report()
+    assert report["deferred"] == {WALLETS: 3}
+    assert report["deferred_after_failure"] == {WALLETS: 1}
+
+
+def test_empty_deferred_frame_has_columns():
+    assert list(RunBudget().deferred_frame().columns) == [
+        "stage",
+        "item",
+        "after_failure",
+    ]
@@ -0,0 +1,22 @@
+import asyncio
+
+import pytest
+
+from src.cli import build_parser
+from src.pipeline import scrape_wallets
+
+
+def test_wallets_chain_is_validated():
+    parser = build_parser()
+
+    assert parser.parse_args(["wallets", "--input", "x"]).chain == "sol"
+    assert (
+        parser.parse_args(["wallets", "--input", "x", "--chain", "eth"]).chain == "eth"
+    )
+    with pytest.raises(SystemExit):
+        parser.parse_args(["wallets", "--input", "x", "--chain", "solana"])
+
+
+def test_unknown_wallet_chain_is_not_replaced():
+    with pytest.raises(ValueError, match="solana"):
+        asyncio.run(scrape_wallets(["w"], chain_name="solana"))
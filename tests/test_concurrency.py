@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from src.utils.concurrency import AdaptiveLimiter
+
+
+def limiter(**kwargs) -> AdaptiveLimiter:
+    options = {
+        "min_limit": 1,
+        "max_limit": 4,
+        "initial": 2,
+        "window": 3,
+        "latency_target": 60,
+        "min_success_rate": 0.5,
+        "decrease_factor": 0.5,
+    }
+    return AdaptiveLimiter("test", **{**options, **kwargs})
+
+
+async def complete(limiter: AdaptiveLimiter, ok: bool = True, timeout: bool = False):
+    async with limiter.slot() as slot:
+        if ok:
+            slot.success()
+        else:
+            slot.failure(timeout=timeout)
+
+
+def test_additive_increase_up_to_max():
+    async def run():
+        aimd = limiter()
+        for _ in range(2):
+            await complete(aimd)
+        assert aimd.limit == 2
+        await complete(aimd)
+        assert aimd.limit == 3
+        for _ in range(9):
+            await complete(aimd)
+        return aimd.limit
+
+    assert asyncio.run(run()) == 4
+
+
+def test_timeout_cuts_limit_once_per_burst():
+    async def run():
+        aimd = limiter(initial=4)
+        # Both tasks started before the first cut
+        slots = [aimd.slot() for _ in range(2)]
+        entered = [await slot.__aenter__() for slot in slots]
+        for context, slot in zip(slots, entered):
+            slot.failure(timeout=True)
+            await context.__aexit__(None, None, None)
+        assert aimd.limit == 2
+
+        await complete(aimd, ok=False, timeout=True)
+        assert aimd.limit == 1
+        await complete(aimd, ok=False, timeout=True)
+        return aimd.limit
+
+    assert asyncio.run(run()) == 1
+
+
+def test_low_success_rate_decreases():
+    async def run():
+        aimd = limiter(initial=4)
+        await complete(aimd)
+        await complete(aimd, ok=False)
+        await complete(aimd, ok=False)
+        return aimd.limit
+
+    assert asyncio.run(run()) == 2
+
+
+def test_slow_window_holds_limit():
+    async def run():
+        aimd = limiter(latency_target=-1)
+        for _ in range(6):
+            await complete(aimd)
+        return aimd.limit
+
+    assert asyncio.run(run()) == 2
+
+
+def test_cancelled_slots_are_not_counted():
+    async def run():
+        aimd = limiter()
+        for _ in range(5):
+            async with aimd.slot() as slot:
+                slot.cancel()
+        return aimd.limit, aimd._completed
+
+    assert asyncio.run(run()) == (2, 0)
+
+
+def test_exception_releases_slot_as_failure():
+    async def run():
+        aimd = limiter()
+        with pytest.raises(RuntimeError):
+            async with aimd.slot():
+                raise RuntimeError("boom")
+        return aimd.in_flight, aimd._completed, aimd._successes
+
+    assert asyncio.run(run()) == (0, 1, 0)
+
+
+def test_in_flight_never_exceeds_limit():
+    async def run():
+        aimd = limiter(initial=2, window=100)
+        active = peak = 0
+
+        async def task():
+            nonlocal active, peak
+            async with aimd.slot() as slot:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                slot.success()
+
+        await asyncio.gather(*(task() for _ in range(8)))
+        return peak, aimd.waiting, aimd.in_flight
+
+    assert asyncio.run(run()) == (2, 0, 0)
@@ -0,0 +1,282 @@
+import asyncio
+import http.client
+from contextlib import aclosing
+
+import pytest
+
+from src import config
+from src.models.chains import Chain
+from src.models.days_options import DaysOptions
+from src.models.records import WalletProfile, WalletStatsRecord
+from src.scraper.dexscreener_traders_scraper import DexscreenerTradersScraper
+from src.scraper.wallet_portfolio_scraper import WalletPortfolioScraper
+from src.simulation.mock_server import MockSite, MockSiteConfig
+from src.utils.fetcher import Fetcher, FetchPath, HttpClient, HttpResponse
+
+WALLET = "Wa11et1111111111111111111111111111111111111"
+
+
+def wallet_url(server) -> str:
+    return f"{server.url}/sol/address/{WALLET}"
+
+
+def parse_wallet(response):
+    return WalletPortfolioScraper(snapshots=object())._get_wallet_stats_texts_html(
+        response
+    )
+
+
+async def from_browser():
+    return "browser"
+
+
+def fetch(fetcher, url, parse_http=parse_wallet):
+    return asyncio.run(fetcher.fetch(url, parse_http, from_browser))
+
+
+def test_static_page_is_served_over_http(mock_server):
+    server = mock_server()
+    fetcher = Fetcher(HttpClient())
+
+    result = fetch(fetcher, wallet_url(server))
+
+    assert result.path == FetchPath.HTTP
+    assert result.value == server.site.wallet_stats(WALLET)["7d"]
+    assert fetcher.served == {FetchPath.HTTP: 1}
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"interstitial_rate": 1.0},
+        {"error_rate": 1.0},
+        # The stats panel is rendered client-side, so the markup lacks it
+        {"selector_delay": 0.5},
+    ],
+)
+def test_unusable_responses_fall_back_to_browser(mock_server, config):
+    server = mock_server(**config)
+    fetcher = Fetcher(HttpClient())
+
+    result = fetch(fetcher, wallet_url(server))
+
+    assert result.path == FetchPath.BROWSER
+    assert result.value == "browser"
+    assert fetcher.served == {FetchPath.BROWSER: 1}
+
+
+def test_browser_only_items_skip_http(mock_server):
+    server = mock_server()
+    fetcher = Fetcher(HttpClient())
+
+    disabled = Fetcher(HttpClient(), enabled=False)
+
+    assert fetch(fetcher, wallet_url(server), parse_http=None).path == FetchPath.BROWSER
+    assert fetch(disabled, wallet_url(server)).path == FetchPath.BROWSER
+    assert server.site.log.records() == []
+
+
+def test_connections_are_kept_alive(mock_server):
+    server = mock_server()
+    client = HttpClient()
+
+    for _ in range(3):
+        response = asyncio.run(client.get(wallet_url(server)))
+        assert response.status == 200
+
+    idle = client._idle[("http", server.url.removeprefix("http://"))]
+    assert idle.qsize() == 1
+    client.close()
+
+
+def test_dropped_keep_alive_connection_is_retried(mock_server):
+    server = mock_server()
+    client = HttpClient()
+    url = wallet_url(server)
+    asyncio.run(client.get(url))
+
+    idle = client._idle[("http", server.url.removeprefix("http://"))]
+    stale = idle.get_nowait()
+    stale.sock.close()
+    idle.put(stale)
+
+    assert asyncio.run(client.get(url)).status == 200
+    assert idle.qsize() == 1
+    assert idle.get_nowait() is not stale
+
+
+class RefusedConnection(http.client.HTTPConnection):
+    closed = 0
+
+    def connect(self):
+        raise ConnectionRefusedError("refused")
+
+    def close(self):
+        RefusedConnection.closed += 1
+        super().close()
+
+
+def test_failed_retry_closes_connection(mock_server, monkeypatch):
+    server = mock_server()
+    client = HttpClient()
+    url = wallet_url(server)
+    asyncio.run(client.get(url))
+
+    idle = client._idle[("http", server.url.removeprefix("http://"))]
+    idle.queue[0].sock.close()
+    monkeypatch.setattr(
+        client, "_connect", lambda scheme, netloc: RefusedConnection(netloc)
+    )
+
+    with pytest.raises(ConnectionRefusedError):
+        asyncio.run(client.get(url))
+    assert RefusedConnection.closed >= 1
+    assert idle.qsize() == 0
+
+
+class NoSnapshots:
+    def save(self, *args):
+        pass
+
+
+def wallet_scraper(server, monkeypatch):
+    monkeypatch.setattr(config, "GMGN_BASE_URL", server.url)
+    fetcher = Fetcher(HttpClient())
+    scraper = WalletPortfolioScraper(fetcher, snapshots=NoSnapshots())
+    browsed = []
+
+    async def in_browser(wallet, chain, days_options, with_holdings, **kwargs):
+        browsed.append([option.value for option in days_options])
+        return WalletProfile(
+            wallet=wallet,
+            chain=chain.value,
+            stats={
+                option.value: WalletStatsRecord(wallet, chain.value, option.value)
+                for option in days_options
+            },
+            holdings=[{"token": "BONK"}] if with_holdings else [],
+        )
+
+    monkeypatch.setattr(scraper, "_process_wallet_in_browser", in_browser)
+    return scraper, browsed
+
+
+def process_wallet(scraper, days_options, with_holdings):
+    return asyncio.run(
+        scraper._process_wallet(
+            WALLET,
+            chain=Chain.SOL,
+            limiter=None,
+            session=None,
+            days_options=days_options,
+            with_holdings=with_holdings,
+        )
+    )
+
+
+def test_wallet_default_window_served_over_http(mock_server, monkeypatch):
+    server = mock_server()
+    scraper, browsed = wallet_scraper(server, monkeypatch)
+
+    profile = process_wallet(scraper, [DaysOptions.WEEK], with_holdings=False)
+
+    assert browsed == []
+    assert profile.stats["7d"].fetch_path == "http"
+    assert profile.stats["7d"].winrate is not None
+    assert scraper.fetcher.served == {FetchPath.HTTP: 1}
+
+
+@pytest.mark.parametrize(
+    "days_options, with_holdings",
+    [
+        ([DaysOptions.WEEK, DaysOptions.MONTH], True),
+        ([DaysOptions.WEEK], True),
+        ([DaysOptions.MONTH], False),
+    ],
+)
+def test_wallet_needing_browser_skips_http_probe(
+    mock_server, monkeypatch, days_options, with_holdings
+):
+    server = mock_server()
+    scraper, browsed = wallet_scraper(server, monkeypatch)
+
+    profile = process_wallet(scraper, days_options, with_holdings)
+
+    # The browser visit cannot be spared, so GMGN gets no extra request
+    assert server.site.log.records() == []
+    assert browsed == [[option.value for option in days_options]]
+    assert {record.fetch_path for record in profile.stats.values()} == {"browser"}
+    assert scraper.fetcher.served == {FetchPath.BROWSER: 1}
+
+
+def test_stream_closes_browser_stream_when_caller_stops(mock_server):
+    server = mock_server(interstitial_rate=1.0)
+    fetcher = Fetcher(HttpClient())
+    closed = []
+
+    async def stream_browser():
+        try:
+            for value in range(10):
+                yield value
+        finally:
+            closed.append(True)
+
+    async def first_two():
+        values = []
+        async with aclosing(
+            fetcher.stream(wallet_url(server), lambda response: [], stream_browser)
+        ) as results:
+            async for result in results:
+                values.append((result.value, result.path))
+                if len(values) == 2:
+                    break
+        return values
+
+    assert asyncio.run(first_two()) == [(0, FetchPath.BROWSER), (1, FetchPath.BROWSER)]
+    assert closed == [True]
+    assert fetcher.served == {FetchPath.BROWSER: 1}
+
+
+class StaticClient:
+    """
+    Serves fixed markup, like a server-side rendered Top Traders list.
+    """
+
+    def __init__(self, body: str):
+        self.body = body.encode()
+
+    async def get(self, url):
+        return HttpResponse(url, 200, {"content-type": "text/html"}, self.body)
+
+
+def traders_markup(rows) -> str:
+    cells = "".join(
+        "<div class='row'>"
+        + "".join(f"<div>{cell}</div>" for cell in row[:7])
+        + f"<div><a href='https://solscan.io/account/{row[7]}'>Solscan</a></div>"
+        + "</div>"
+        for row in rows
+    )
+    return (
+        "<html><head><title>DEX Screener</title></head><body><div id='list'>"
+        "<div class='row'><span>RANK</span><span>MAKER</span></div>"
+        f"{cells}</div></body></html>"
+    )
+
+
+def test_top_traders_streamed_over_http():
+    rows = MockSite(MockSiteConfig(traders_per_token=12)).traders(0)
+    fetcher = Fetcher(StaticClient(traders_markup(rows)))
+    scraper = DexscreenerTradersScraper(fetcher, snapshots=NoSnapshots())
+
+    async def stream(max_rows):
+        async with aclosing(
+            scraper.stream_top_traders("solana", "token", max_rows=max_rows)
+        ) as records:
+            return [record async for record in records]
+
+    records = asyncio.run(stream(max_rows=5))
+    assert [record.wallet for record in records] == [row[7] for row in rows[:5]]
+    assert {record.fetch_path for record in records} == {"http"}
+    assert len(asyncio.run(stream(max_rows=50))) == 12
+    assert fetcher.served == {FetchPath.HTTP: 2}
@@ -0,0 +1,54 @@
+from src.utils.html import parse_html, page_title
+
+PAGE = """<!DOCTYPE html>
+<html><head><title> GMGN.AI </title><style>p { color: red }</style></head>
+<body>
+<div id="__next"><main>
+  <div>first</div>
+  <div class="row wide"><span>Win&nbsp;Rate</span><p>52.1%</p><br><img src="x"></div>
+  <div><p>unclosed</div>
+  <div>after</div>
+</main></div>
+<script>const hidden = 1;</script>
+</body></html>"""
+
+
+def test_xpath_id_and_positional_steps():
+    document = parse_html(PAGE)
+    assert document.xpath("//*[@id='__next']/main/div[1]").inner_text() == "first"
+    assert document.xpath("xpath=//*[@id='__next']/main/div[2]/p").inner_text() == (
+        "52.1%"
+    )
+    assert document.xpath('//*[@id="__next"]/main/div[2]/span').tag == "span"
+
+
+def test_xpath_misses_return_none():
+    document = parse_html(PAGE)
+    assert document.xpath("//*[@id='__next']/main/div[5]") is None
+    assert document.xpath("//*[@id='missing']/div") is None
+    assert document.xpath("//*[@id='__next']/main/table") is None
+    assert document.xpath("main/div") is None
+
+
+def test_inner_text_breaks_lines_on_blocks_and_skips_scripts():
+    document = parse_html(PAGE)
+    row = document.xpath("//*[@id='__next']/main/div[2]")
+    assert row.inner_text() == "Win Rate\n52.1%"
+    assert "hidden" not in document.inner_text()
+    assert "color" not in document.inner_text()
+
+
+def test_void_and_unclosed_tags_keep_tree_shape():
+    document = parse_html(PAGE)
+    row = document.xpath("//*[@id='__next']/main/div[2]")
+    assert [child.tag for child in row.elements] == ["span", "p", "br", "img"]
+    # The unclosed <p> is unwound by its parent's end tag
+    assert document.xpath("//*[@id='__next']/main/div[4]").inner_text() == "after"
+
+
+def test_find_by_class_and_title():
+    document = parse_html(PAGE)
+    assert document.find("div", classes=("wide",)).get("class") == "row wide"
+    assert document.find("div", classes=("narrow",)) is None
+    assert page_title(document) == "GMGN.AI"
+    assert page_title(parse_html("<p>no title</p>")) == ""
@@ -0,0 +1,137 @@
+import random
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.simulation.loadtest import build_parser, percentile, summarize_requests
+from src.simulation.mock_server import (
+    ERROR,
+    INTERSTITIAL,
+    NOT_FOUND,
+    OK,
+    TOKENS_ROUTE,
+    TRADERS_ROUTE,
+    WALLET_ROUTE,
+    Latency,
+    MockSite,
+    MockSiteConfig,
+    RequestRecord,
+)
+
+
+def get(url: str, cookie: str = "") -> int:
+    request = urllib.request.Request(url, headers={"Cookie": cookie})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def logged(site, count: int):
+    # Requests are logged after the response is sent
+    deadline = time.monotonic() + 2
+    while len(site.log.records()) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return site.log.records()
+
+
+def test_percentile_is_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 0) == 1
+    assert percentile([], 50) is None
+
+
+def test_summarize_requests_per_route():
+    records = [
+        RequestRecord(WALLET_ROUTE, 200, OK, seconds, 0.0)
+        for seconds in (0.01, 0.02, 0.03, 0.04)
+    ] + [RequestRecord(TOKENS_ROUTE, 500, ERROR, 0.5, 0.0)]
+
+    summary = summarize_requests(records)
+
+    assert list(summary) == [TOKENS_ROUTE, WALLET_ROUTE]
+    assert summary[WALLET_ROUTE]["requests"] == 4
+    assert summary[WALLET_ROUTE]["outcomes"] == {OK: 4}
+    assert summary[WALLET_ROUTE]["p50_ms"] == 20.0
+    assert summary[WALLET_ROUTE]["max_ms"] == 40.0
+    assert summary[TOKENS_ROUTE]["outcomes"] == {ERROR: 1}
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("fixed:20", Latency("fixed", 20, 0)),
+        ("uniform:10,30", Latency("uniform", 10, 30)),
+        ("lognormal:80,0.5", Latency("lognormal", 80, 0.5)),
+    ],
+)
+def test_latency_spec_round_trip(spec, expected):
+    latency = Latency.parse(spec)
+    assert latency == expected
+    assert str(latency) == spec
+
+
+def test_latency_samples_in_seconds():
+    rng = random.Random(0)
+    assert Latency.parse("fixed:20").sample(rng) == 0.02
+    assert all(
+        0.01 <= Latency.parse("uniform:10,30").sample(rng) <= 0.03 for _ in range(50)
+    )
+    with pytest.raises(ValueError):
+        Latency.parse("uniform:10")
+    assert build_parser().parse_args(["--latency", "fixed:5"]).latency.a == 5
+
+
+def test_site_is_deterministic_per_seed():
+    first = MockSite(MockSiteConfig(seed=1))
+    again = MockSite(MockSiteConfig(seed=1))
+    other = MockSite(MockSiteConfig(seed=2))
+
+    assert first.traders(0) == again.traders(0)
+    assert first.wallet_stats("w") == again.wallet_stats("w")
+    assert first.traders(0) != other.traders(0)
+
+
+def test_routes(mock_server):
+    server = mock_server(tokens=3)
+    site = server.site
+    token = site.token_address(0)
+
+    assert get(f"{server.url}/solana") == 200
+    assert get(f"{server.url}/solana/page-2") == 200
+    assert get(f"{server.url}/solana/{token}") == 200
+    assert get(f"{server.url}/sol/address/w1") == 200
+    assert get(f"{server.url}/solana/unknown") == 404
+
+    # Handler threads log in completion order, which may differ from send order
+    routes = sorted((record.route, record.outcome) for record in logged(site, 5))
+    assert routes == sorted(
+        [
+            (TOKENS_ROUTE, OK),
+            (TOKENS_ROUTE, OK),
+            (TRADERS_ROUTE, OK),
+            (WALLET_ROUTE, OK),
+            (TRADERS_ROUTE, NOT_FOUND),
+        ]
+    )
+
+
+def test_injected_faults(mock_server):
+    errors = mock_server(error_rate=1.0)
+    assert get(f"{errors.url}/solana") == 500
+
+    challenges = mock_server(interstitial_rate=1.0)
+    assert get(f"{challenges.url}/solana") == 503
+    # The clearance cookie set by the challenge page lets requests through
+    assert get(f"{challenges.url}/solana", cookie="cf_clearance=mock") == 200
+
+    assert [record.outcome for record in logged(errors.site, 1)] == [ERROR]
+    assert sorted(record.outcome for record in logged(challenges.site, 2)) == [
+        INTERSTITIAL,
+        OK,
+    ]
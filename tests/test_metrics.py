@@ -0,0 +1,89 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.utils.metrics import (
+    CONTENT_TYPE,
+    PAGES_FETCHED,
+    Metric,
+    MetricsRegistry,
+    MetricsServer,
+)
+
+
+def test_metric_base_is_abstract():
+    with pytest.raises(TypeError):
+        Metric("snuffy_test", "Test.")
+
+
+def test_counter_exposition():
+    registry = MetricsRegistry()
+    pages = registry.counter("snuffy_pages_total", "Pages.", ["host", "fetch_path"])
+    pages.inc(host="a", fetch_path="http")
+    pages.inc(2, host="a", fetch_path="http")
+    pages.inc(host='b"\n', fetch_path="browser")
+
+    assert registry.render().splitlines() == [
+        "# HELP snuffy_pages_total Pages.",
+        "# TYPE snuffy_pages_total counter",
+        'snuffy_pages_total{host="a",fetch_path="http"} 3',
+        'snuffy_pages_total{host="b\\"\\n",fetch_path="browser"} 1',
+    ]
+
+
+def test_labels_must_match():
+    registry = MetricsRegistry()
+    pages = registry.counter("snuffy_pages_total", "Pages.", ["host"])
+    with pytest.raises(ValueError):
+        pages.inc(path="x")
+    with pytest.raises(ValueError):
+        PAGES_FETCHED.inc(host="a", path="http")
+
+
+def test_gauge_values_and_function():
+    registry = MetricsRegistry()
+    queue = registry.gauge("snuffy_queue", "Queue.", ["stage"])
+    queue.set(5, stage="wallets")
+    queue.dec(2, stage="wallets")
+    registry.gauge("snuffy_rss", "RSS.", ["process"], function=lambda: {("py",): 1.5})
+    registry.gauge("snuffy_broken", "Broken.", function=lambda: 1 / 0)
+    registry.gauge("snuffy_plain", "Plain.", function=lambda: 7)
+
+    lines = registry.render().splitlines()
+    assert 'snuffy_queue{stage="wallets"} 3' in lines
+    assert 'snuffy_rss{process="py"} 1.5' in lines
+    assert "snuffy_plain 7" in lines
+    # A failing collector only drops its own samples
+    assert "# TYPE snuffy_broken gauge" in lines
+    assert not any(line.startswith("snuffy_broken ") for line in lines)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    wait = registry.histogram("snuffy_wait_seconds", "Wait.", ["host"], buckets=(1, 5))
+    for value in (0.5, 2, 10):
+        wait.observe(value, host="a")
+
+    assert registry.render().splitlines()[2:] == [
+        'snuffy_wait_seconds_bucket{host="a",le="1"} 1',
+        'snuffy_wait_seconds_bucket{host="a",le="5"} 2',
+        'snuffy_wait_seconds_bucket{host="a",le="+Inf"} 3',
+        'snuffy_wait_seconds_sum{host="a"} 12.5',
+        'snuffy_wait_seconds_count{host="a"} 3',
+    ]
+
+
+def test_server_exposes_registry():
+    registry = MetricsRegistry()
+    registry.counter("snuffy_runs_total", "Runs.").inc()
+    server = MetricsServer(registry, host="127.0.0.1", port=0).start()
+    try:
+        host, port = server.httpd.server_address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert "snuffy_runs_total 1" in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://{host}:{port}/other")
+    finally:
+        server.stop()
@@ -0,0 +1,77 @@
+import asyncio
+import csv
+import os
+import signal
+import time
+
+import pytest
+
+from src.utils.profiling import Profiler
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(signal, "SIGPROF"), reason="needs the SIGPROF timer"
+)
+
+
+def busy(seconds: float):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def read_csv(path: str):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_sampler_only_armed_inside_stages(tmp_path):
+    profiler = Profiler(
+        enabled=True,
+        output_dir=str(tmp_path),
+        lag_threshold=0.05,
+        sample_interval=0.001,
+    )
+    timers = {}
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        timers["outside"] = signal.getitimer(signal.ITIMER_PROF)
+        with profiler.stage("parse"):
+            timers["inside"] = signal.getitimer(signal.ITIMER_PROF)
+            with profiler.stage("nested"):
+                pass
+            timers["after_nested"] = signal.getitimer(signal.ITIMER_PROF)
+            busy(0.1)
+        timers["after"] = signal.getitimer(signal.ITIMER_PROF)
+        timers["debug"] = loop.get_debug()
+
+    asyncio.run(profiler.profile(run()))
+
+    assert timers["outside"] == (0.0, 0.0)
+    assert timers["inside"] != (0.0, 0.0)
+    assert timers["after_nested"] != (0.0, 0.0)
+    assert timers["after"] == (0.0, 0.0)
+    assert timers["debug"] is False
+
+    stages = {
+        row["stage"]: row
+        for row in read_csv(os.path.join(profiler.run_dir, "stages.csv"))
+    }
+    assert stages["parse"]["calls"] == "1"
+    assert int(stages["parse"]["samples"]) > 0
+    assert os.path.exists(os.path.join(profiler.run_dir, "profile_parse.folded"))
+
+    slow = read_csv(os.path.join(profiler.run_dir, "slow_stages.csv"))
+    assert [row["stage"] for row in slow] == ["parse"]
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    profiler = Profiler(enabled=False, output_dir=str(tmp_path))
+
+    async def run():
+        with profiler.stage("parse"):
+            return signal.getitimer(signal.ITIMER_PROF)
+
+    assert asyncio.run(profiler.profile(run())) == (0.0, 0.0)
+    assert profiler.stage_calls == {}
+    assert list(tmp_path.iterdir()) == []
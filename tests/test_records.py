@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from src.models.records import (
+    TraderRecord,
+    TraderTable,
+    WalletStatsRecord,
+    WalletStatsTable,
+)
+
+
+def traders():
+    return TraderTable(
+        [
+            TraderRecord("a", "solana", "tok1", buy_txns=3, pnl=1.5, fetch_path="http"),
+            TraderRecord("b", "solana", "tok2", buy_usd_amount=10.0),
+            TraderRecord("c", "solana", "tok1", buy_txns=0, fetch_path="browser"),
+        ]
+    )
+
+
+def test_dtypes_follow_schema():
+    df = traders().to_dataframe()
+
+    assert list(df.columns) == list(TraderTable.schema)
+    assert df["wallet"].dtype == "string"
+    assert df["chain"].dtype == "category"
+    assert df["buy_txns"].dtype == "Int32"
+    assert df["pnl"].dtype == "float64"
+
+    stats = WalletStatsTable([WalletStatsRecord("w", "sol", "7d", winrate=0.5)])
+    stats_df = stats.to_dataframe()
+    assert stats_df["winrate"].dtype == "float32"
+    assert stats_df["winrate"].iloc[0] == np.float32(0.5)
+
+
+def test_missing_values_become_na_or_nan():
+    df = traders().to_dataframe()
+
+    assert df["buy_txns"].tolist()[0] == 3
+    assert df["buy_txns"].isna().tolist() == [False, True, False]
+    # A zero is a value, not a missing entry
+    assert df["buy_txns"].iloc[2] == 0
+    assert np.isnan(df["pnl"].iloc[1])
+    assert df["sol_scan_url"].isna().all()
+
+    stats_df = WalletStatsTable([WalletStatsRecord("w", "sol", "7d")]).to_dataframe()
+    assert stats_df["winrate"].isna().all()
+    assert stats_df["error"].isna().all()
+
+
+def test_category_codes_keep_first_seen_order_and_none():
+    df = traders().to_dataframe()
+
+    assert list(df["token_address"].cat.categories) == ["tok1", "tok2"]
+    assert df["token_address"].tolist() == ["tok1", "tok2", "tok1"]
+    assert df["token_address"].cat.codes.tolist() == [0, 1, 0]
+    # None is stored as code -1, which pandas reads as missing
+    assert df["fetch_path"].cat.codes.tolist() == [0, -1, 1]
+    assert df["fetch_path"].isna().tolist() == [False, True, False]
+
+
+def test_empty_table_frame():
+    table = TraderTable()
+    df = table.to_dataframe()
+
+    assert len(table) == 0
+    assert df.empty
+    assert list(df.columns) == list(TraderTable.schema)
+    assert df["buy_txns"].dtype == "Int32"
+    assert df["chain"].dtype == "category"
+    assert df["pnl"].dtype == "float64"
+
+
+def test_extend_matches_constructor():
+    records = [TraderRecord("a", "solana", "tok1", buy_txns=1)]
+    table = TraderTable()
+    table.extend(records)
+    table.append(TraderRecord("b", "solana", "tok1"))
+
+    assert len(table) == 2
+    pd.testing.assert_frame_equal(
+        table.to_dataframe().iloc[:1],
+        TraderTable(records).to_dataframe(),
+        check_categorical=False,
+    )
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from src.analysis.screening import TraderScreener
+
+
+def traders(**columns) -> pd.DataFrame:
+    base = {
+        "wallet": ["a", "b", "c"],
+        "buy_txns": pd.array([1, 9, None], dtype="Int32"),
+        "buy_usd_amount": [100.0, 100.0, 100.0],
+        "pnl": [300.0, 300.0, 300.0],
+    }
+    return pd.DataFrame({**base, **columns})
+
+
+def test_missing_buy_txns_count_as_zero():
+    result = TraderScreener().screen(traders())
+    assert result.wallets == ["a", "c"]
+
+
+def test_pnl_ratio_requires_buys():
+    result = TraderScreener().screen(
+        traders(buy_usd_amount=[100.0, 100.0, 0.0], pnl=[150.0, 300.0, 300.0])
+    )
+    assert result.wallets == []
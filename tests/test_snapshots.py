@@ -0,0 +1,63 @@
+import pandas as pd
+
+from src.models.records import WalletStatsTable
+from src.scraper.wallet_portfolio_scraper import WalletPortfolioScraper
+from src.simulation.mock_server import MockSite, MockSiteConfig
+from src.storage.replay import replay_wallets
+from src.storage.snapshots import TRADERS, WALLETS, SnapshotStore
+
+DAY = 24 * 3600
+# 2024-01-01 12:00 UTC
+NOON = 1704110400.0
+
+
+def test_round_trip_across_days(tmp_path):
+    store = SnapshotStore(directory=str(tmp_path), enabled=True)
+    for offset in (0, DAY, 2 * DAY):
+        store.save(TRADERS, f"https://x/{offset}", {"rows": [offset]}, ts=NOON + offset)
+
+    assert len(list((tmp_path / TRADERS).iterdir())) == 3
+    snapshots = list(store.iter(TRADERS))
+    assert [snapshot.payload for snapshot in snapshots] == [
+        {"rows": [0]},
+        {"rows": [DAY]},
+        {"rows": [2 * DAY]},
+    ]
+    assert snapshots[0].url == "https://x/0"
+    assert snapshots[0].ts == NOON
+
+    within = list(store.iter(TRADERS, start=NOON + 1, end=NOON + 2 * DAY))
+    assert [snapshot.ts for snapshot in within] == [NOON + DAY, NOON + 2 * DAY]
+
+
+def test_appends_to_the_same_day(tmp_path):
+    store = SnapshotStore(directory=str(tmp_path), enabled=True)
+    store.save(TRADERS, "a", 1, ts=NOON)
+    store.save(TRADERS, "b", 2, ts=NOON + 60)
+
+    assert [snapshot.url for snapshot in store.iter(TRADERS)] == ["a", "b"]
+
+
+def test_disabled_store_writes_nothing(tmp_path):
+    store = SnapshotStore(directory=str(tmp_path), enabled=False)
+    store.save(TRADERS, "a", 1)
+
+    assert list(tmp_path.iterdir()) == []
+    assert list(store.iter(TRADERS)) == []
+
+
+def test_replayed_wallets_match_live_parse(tmp_path):
+    store = SnapshotStore(directory=str(tmp_path), enabled=True)
+    scraper = WalletPortfolioScraper(snapshots=store)
+    site = MockSite(MockSiteConfig())
+
+    live = []
+    for wallet in ("w1", "w2"):
+        for days_option, texts in site.wallet_stats(wallet).items():
+            live.append(
+                scraper._build_wallet_record("url", wallet, "sol", days_option, texts)
+            )
+
+    replayed = replay_wallets(store)
+    pd.testing.assert_frame_equal(replayed, WalletStatsTable(live).to_dataframe())
+    assert len(list(store.iter(WALLETS))) == 4
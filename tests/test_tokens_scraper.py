@@ -0,0 +1,69 @@
+import asyncio
+
+from src.scraper import dexscreener_tokens_scraper as module
+from src.scraper.dexscreener_tokens_scraper import DexscreenerTokensScraper
+from src.utils import memory
+from src.utils.fetcher import Fetcher
+from src.utils.memory import MemoryAction
+from tests.fakes import FakePlaywright, no_wait
+
+
+def scrape(monkeypatch, pages: int, window: int):
+    monkeypatch.setattr(module, "async_playwright", FakePlaywright)
+    monkeypatch.setattr(module, "human_delay", no_wait)
+    monkeypatch.setattr(memory.memory_governor, "check", lambda: MemoryAction.NONE)
+
+    scraper = DexscreenerTokensScraper(
+        prefetch_window=window, fetcher=Fetcher(enabled=False)
+    )
+    stats = {"active": 0, "peak": 0, "contexts": {}}
+
+    async def process_page(context, chain_name, page_num, filter_args=None):
+        stats["active"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        stats["contexts"].setdefault(id(context), []).append(page_num)
+        # Later pages finish first, so completion order differs from page order
+        await asyncio.sleep(0.001 * (pages - page_num))
+        stats["active"] -= 1
+        return [{"page": page_num, "row": row} for row in range(2)]
+
+    monkeypatch.setattr(scraper, "_process_page", process_page)
+    rows = asyncio.run(scraper.get_tokens("solana", from_page=1, to_page=pages))
+    return rows, stats
+
+
+def test_pages_bounded_by_window_and_merged_in_order(monkeypatch, launches):
+    rows, stats = scrape(monkeypatch, pages=7, window=3)
+
+    assert stats["peak"] == 3
+    assert [(row["page"], row["row"]) for row in rows] == [
+        (page, row) for page in range(1, 8) for row in range(2)
+    ]
+    assert {row["fetch_path"] for row in rows} == {"browser"}
+
+
+def test_one_reused_context_per_slot_closed_at_end(monkeypatch, launches):
+    rows, stats = scrape(monkeypatch, pages=7, window=3)
+
+    assert len(launches) == 1
+    browser = launches[0]
+    # Each slot opens one context and keeps it for all of its pages
+    assert len(browser.created) == 3
+    assert sum(len(pages) for pages in stats["contexts"].values()) == 7
+    assert all(context.closed for context in browser.created)
+    assert browser.contexts == []
+    assert browser.closed
+
+
+def test_window_larger_than_page_count(monkeypatch, launches):
+    rows, stats = scrape(monkeypatch, pages=2, window=5)
+
+    assert len(launches[0].created) == 2
+    assert [row["page"] for row in rows] == [1, 1, 2, 2]
+
+
+def test_no_pages_never_launch_browser(monkeypatch, launches):
+    rows, stats = scrape(monkeypatch, pages=0, window=3)
+
+    assert rows == []
+    assert launches == []
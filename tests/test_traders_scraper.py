@@ -0,0 +1,84 @@
+import asyncio
+
+from src.scraper import dexscreener_traders_scraper as module
+from src.scraper.dexscreener_traders_scraper import DexscreenerTradersScraper
+from src.utils.fetcher import Fetcher
+from tests.fakes import no_wait
+
+
+class NoSnapshots:
+    def save(self, *args):
+        pass
+
+
+class FakeRows:
+    """Locator over the trader rows, rendering `batches` one read at a time."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.scrolls = []
+
+    def locator(self, selector):
+        return self
+
+    @property
+    def last(self):
+        return self
+
+    async def evaluate_all(self, script):
+        return self.batches.pop(0) if self.batches else []
+
+    async def scroll_into_view_if_needed(self, timeout):
+        self.scrolls.append(timeout)
+
+
+class FakePage:
+    url = "https://dexscreener.com/solana/token"
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def locator(self, selector):
+        return self.rows
+
+
+def trader_row(wallet):
+    return {"sol_scan_url": f"https://solscan.io/account/{wallet}", "stats": []}
+
+
+def harvest(monkeypatch, batches, **kwargs):
+    monkeypatch.setattr(module, "human_delay", no_wait)
+    scraper = DexscreenerTradersScraper(Fetcher(enabled=False), snapshots=NoSnapshots())
+    monkeypatch.setattr(
+        scraper,
+        "_parse_trader_rows",
+        lambda raw_rows, *args: [row["sol_scan_url"] for row in raw_rows],
+    )
+    rows = FakeRows(batches)
+
+    async def collect():
+        records = scraper._harvest_top_traders(
+            FakePage(rows), "solana", "token", **kwargs
+        )
+        return [record async for record in records]
+
+    return asyncio.run(collect()), rows
+
+
+def test_unrendered_list_stops_without_scrolling(monkeypatch):
+    records, rows = harvest(monkeypatch, [])
+
+    assert records == []
+    assert rows.scrolls == []
+
+
+def test_harvest_scrolls_until_idle(monkeypatch):
+    batches = [
+        [trader_row("a"), trader_row("b")],
+        [trader_row("b"), trader_row("c")],
+    ]
+    records, rows = harvest(monkeypatch, batches, max_idle_scrolls=2)
+
+    assert [url.split("/")[-1] for url in records] == ["a", "b", "c"]
+    assert len(rows.scrolls) == 4
+    assert set(rows.scrolls) == {module.SCROLL_TIMEOUT}
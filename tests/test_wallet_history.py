@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from src.storage.wallet_history import STAT_COLUMNS, WalletHistoryStore
+
+
+def stats(rows) -> pd.DataFrame:
+    frame = pd.DataFrame(rows)
+    for column in STAT_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = 1.0
+    frame["chain"] = "sol"
+    frame["days_option"] = "7d"
+    return frame
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = WalletHistoryStore(str(tmp_path / "history.sqlite"))
+    yield store
+    store.close()
+
+
+def test_first_snapshot_is_new(store):
+    changes = store.record(stats([{"wallet": "a"}, {"wallet": "b"}]), ts=1)
+    assert changes["change"].tolist() == ["new", "new"]
+
+
+def test_unchanged_wallet_is_not_emitted(store):
+    store.record(stats([{"wallet": "a", "winrate": 0.5}]), ts=1)
+    changes = store.record(stats([{"wallet": "a", "winrate": 0.51}]), ts=2)
+    assert changes.empty
+
+
+def test_thresholds(store):
+    store.record(
+        stats(
+            [
+                {"wallet": "a", "winrate": 0.5},
+                {"wallet": "b", "usd_balance": 1000.0},
+                {"wallet": "c", "usd_balance": 1000.0},
+            ]
+        ),
+        ts=1,
+    )
+    changes = store.record(
+        stats(
+            [
+                {"wallet": "a", "winrate": 0.6},
+                {"wallet": "b", "usd_balance": 1050.0},
+                {"wallet": "c", "usd_balance": 1500.0},
+            ]
+        ),
+        ts=2,
+    )
+    assert changes["wallet"].tolist() == ["a", "c"]
+    assert (changes["change"] == "changed").all()
+
+
+def test_move_away_from_zero_is_a_change(store):
+    store.record(
+        stats([{"wallet": "a", "usd_balance": 0.0, "total_pnl_usd_amount": 0.0}]),
+        ts=1,
+    )
+    changes = store.record(
+        stats(
+            [{"wallet": "a", "usd_balance": 50000.0, "total_pnl_usd_amount": 90000.0}]
+        ),
+        ts=2,
+    )
+    assert changes["wallet"].tolist() == ["a"]
+    assert changes["usd_balance_prev"].tolist() == [0.0]
+
+
+def test_failed_rows_are_skipped(store):
+    frame = stats([{"wallet": "a"}, {"wallet": "b"}])
+    frame["error"] = [None, "timeout"]
+    changes = store.record(frame, ts=1)
+    assert changes["wallet"].tolist() == ["a"]
+    assert store.history("b").empty
+
+
+def test_latest_returns_newest_snapshot_per_key(store):
+    store.record(stats([{"wallet": "a", "winrate": 0.1}, {"wallet": "b"}]), ts=1)
+    store.record(stats([{"wallet": "a", "winrate": 0.9}]), ts=2)
+
+    latest = store.latest(stats([{"wallet": "a"}, {"wallet": "b"}, {"wallet": "c"}]))
+    latest = latest.set_index("wallet")
+    assert sorted(latest.index) == ["a", "b"]
+    assert latest.loc["a", "ts"] == 2
+    assert latest.loc["a", "winrate"] == 0.9
+    assert latest.loc["b", "ts"] == 1
+
+
+def test_history_range(store):
+    for ts in (1, 2, 3):
+        store.record(stats([{"wallet": "a", "winrate": ts / 10}]), ts=ts)
+    history = store.history("a", start=2, end=3)
+    assert history["ts"].tolist() == [2, 3]
@@ -0,0 +1,131 @@
+import asyncio
+
+from src.models.chains import Chain
+from src.models.days_options import DaysOptions
+from src.scraper import wallet_portfolio_scraper as module
+from src.scraper.wallet_portfolio_scraper import WalletPortfolioScraper
+from src.simulation.mock_server import MockSite, MockSiteConfig
+from src.utils.budget import RunBudget
+from src.utils.concurrency import AdaptiveLimiter
+
+
+class NoSnapshots:
+    def save(self, *args):
+        pass
+
+
+class FakePage:
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+
+class FakeSession:
+    def __init__(self):
+        self.released = 0
+
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+    async def release(self, context):
+        self.released += 1
+
+
+async def no_wait(*args, **kwargs):
+    pass
+
+
+def test_parse_holding_only_converts_amount_columns():
+    scraper = WalletPortfolioScraper(snapshots=NoSnapshots())
+    holding = scraper._parse_holding(
+        ["token", "value", "balance", "last_active", ""],
+        ["1K\nBONK", "$1.2K", "3.5M\n$10", "2d", "ignored"],
+    )
+
+    assert holding == {
+        "token": "1K",
+        "value": 1200.0,
+        "balance": 3500000.0,
+        "last_active": "2d",
+    }
+
+
+def test_holdings_failure_keeps_window_stats(monkeypatch):
+    for name in ("wait_for_cloudflare", "human_delay", "human_random_behaviour"):
+        monkeypatch.setattr(module, name, no_wait)
+
+    texts = MockSite(MockSiteConfig()).wallet_stats("w")
+    scraper = WalletPortfolioScraper(snapshots=NoSnapshots(), budget=RunBudget())
+    visits = []
+
+    async def select(page, days_option):
+        visits.append(days_option.value)
+
+    async def stats_texts(page):
+        return texts[visits[-1]]
+
+    async def holdings(page):
+        raise TimeoutError("Timeout 30000ms exceeded clicking Holding")
+
+    monkeypatch.setattr(scraper, "_close_modals", no_wait)
+    monkeypatch.setattr(scraper, "_select_days_option", select)
+    monkeypatch.setattr(scraper, "_get_wallet_stats_texts", stats_texts)
+    monkeypatch.setattr(scraper, "_get_holdings", holdings)
+
+    session = FakeSession()
+    limiter = AdaptiveLimiter("test", initial=1, window=100)
+    profile = asyncio.run(
+        scraper._process_wallet_in_browser(
+            "w",
+            chain=Chain.SOL,
+            limiter=limiter,
+            session=session,
+            days_options=[DaysOptions.WEEK, DaysOptions.MONTH],
+            with_holdings=True,
+        )
+    )
+
+    assert profile.error is None
+    assert sorted(profile.stats) == ["30d", "7d"]
+    assert profile.stats["30d"].winrate is not None
+    assert profile.holdings == []
+    # One visit, counted as a success
+    assert visits == ["7d", "30d"]
+    assert session.released == 1
+    assert limiter._successes == 1
+
+
+def test_retry_past_deadline_is_deferred_after_failure(monkeypatch):
+    for name in ("wait_for_cloudflare", "human_delay", "human_random_behaviour"):
+        monkeypatch.setattr(module, name, no_wait)
+
+    budget = RunBudget()
+    allowed = iter([True, False])
+    monkeypatch.setattr(budget, "allows", lambda stage: next(allowed))
+    scraper = WalletPortfolioScraper(snapshots=NoSnapshots(), budget=budget)
+
+    async def failing_select(page, days_option):
+        raise RuntimeError("navigation failed")
+
+    monkeypatch.setattr(scraper, "_close_modals", no_wait)
+    monkeypatch.setattr(scraper, "_select_days_option", failing_select)
+
+    profile = asyncio.run(
+        scraper._process_wallet_in_browser(
+            "w",
+            chain=Chain.SOL,
+            limiter=AdaptiveLimiter("test", initial=1, window=100),
+            session=FakeSession(),
+        )
+    )
+
+    assert profile is None
+    assert budget.deferred_after_failure == {"wallets": ["w"]}
+    assert budget.deferred_frame()["after_failure"].tolist() == [True]